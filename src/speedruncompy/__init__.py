@@ -1,6 +1,6 @@
 from .endpoints import *  # noqa
 from .datatypes import *
-from . import api, datatypes, exceptions, config  # noqa
+from . import api, datatypes, exceptions, config, cache, store  # noqa
 
 # Non-core
-from . import auth
\ No newline at end of file
+from . import auth, columnar, export, checkpoint, crawl, localboard, sync, auditlog, moderation
\ No newline at end of file
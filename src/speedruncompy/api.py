@@ -3,7 +3,13 @@ import logging
 import asyncio, aiohttp
 import sys
 import random
-from typing import Awaitable, Callable, Any, ClassVar, Generic, Iterable, TypeVar
+import time
+import contextlib, contextvars
+import enum
+import heapq
+import itertools
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Any, ClassVar, Generic, Iterable, TypeVar
 
 from yarl import URL
 
@@ -11,6 +17,8 @@ from .datatypes._impl import SpeedrunModel, ModelEncoder
 
 from .datatypes import Pagination
 from .exceptions import *
+from .cache import PagePlanner, ParseCache, ResponseCache, fingerprint
+from .store import EntityStore
 from . import config
 
 API_ROOT = "/api/v2/"
@@ -21,6 +29,334 @@ DEFAULT_USER_AGENT = "speedruncompy/"
 _log = logging.getLogger("speedruncompy")
 
 
+class Priority(enum.IntEnum):
+    """Order in which requests waiting on a client's `concurrency` or `rate_limiter` are sent; lower goes first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+class RateLimiter():
+    """Limits requests to `rate` per second, allowing bursts of up to `burst` requests.
+    
+    Waiting requests are granted their turn when it comes due, in order of `Priority`, so an interactive request is not
+    stuck behind sends already booked by a crawl.
+    
+    Only holds asyncio objects while requests are waiting, so may be shared by successive event loops (eg. by repeated
+    `perform_sync` calls)."""
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tat = 0.0
+        """Theoretical arrival time of the next request once the bucket is empty."""
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+    
+    async def acquire(self, priority: Priority = Priority.NORMAL):
+        if not self._waiters and self._take():
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._grant()
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted but cancelled before sending; return the turn
+                self._tat -= 1 / self.rate
+            self._grant()
+            raise
+    
+    def _wait(self) -> float:
+        """Seconds until the next request may be sent."""
+        interval = 1 / self.rate
+        return max(self._tat, time.monotonic()) - time.monotonic() - (self.burst - 1) * interval
+    
+    def _take(self) -> bool:
+        if self._wait() > 0: return False
+        self._tat = max(self._tat, time.monotonic()) + 1 / self.rate
+        return True
+    
+    def _grant(self):
+        """Grant turns that are due to waiters in priority order, and arrange to be called again when the next is due."""
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take(): break
+            _, _, waiter = heapq.heappop(self._waiters)
+            waiter.set_result(None)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(max(self._wait(), 0), self._on_timer)
+    
+    def _on_timer(self):
+        self._timer = None
+        self._grant()
+
+_priority: contextvars.ContextVar[Priority | None] = contextvars.ContextVar("speedruncompy_priority", default=None)
+
+@contextlib.contextmanager
+def priority(level: Priority):
+    """Send requests made within this block (and tasks started from it) at `level`.
+    ```python
+    with priority(Priority.INTERACTIVE):
+        run = await GetRun(runId).perform()
+    ```
+    Requests default to `NORMAL`, except the pages after the first of paginated helpers (eg. `perform_all`), which default to `BULK`."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def _bulk_task(coroutine: Awaitable[Any], group: asyncio.TaskGroup | None = None) -> asyncio.Task:
+    """Run `coroutine` as a task (of `group`, if given) at `BULK` priority, unless a priority has been set explicitly."""
+    context = contextvars.copy_context()
+    if context.get(_priority) is None:
+        context.run(_priority.set, Priority.BULK)
+    if group is not None:
+        # Tasks copy the context current at creation
+        return context.run(group.create_task, coroutine)  # type: ignore
+    return asyncio.get_running_loop().create_task(coroutine, context=context)  # type: ignore
+
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("speedruncompy_deadline", default=None)
+"""Event loop time by which requests in this context must complete."""
+
+@contextlib.asynccontextmanager
+async def deadline(timeout: float | None):
+    """Bound requests made within this block (and tasks started from it), including retries & their delays, to `timeout`
+    seconds; on expiry, requests in flight are cancelled and `TimeoutError` is raised. Nested deadlines can only shorten
+    an enclosing one.
+    ```python
+    async with deadline(2):
+        summary = await GetGameSummary(gameId).perform()
+    ```"""
+    if timeout is None:
+        yield
+        return
+    when = asyncio.get_running_loop().time() + timeout
+    outer = _deadline.get()
+    if outer is not None: when = min(when, outer)
+    token = _deadline.set(when)
+    try:
+        async with asyncio.timeout_at(when):
+            yield
+    finally:
+        _deadline.reset(token)
+
+def _remaining() -> float | None:
+    """Seconds left until the current deadline, if any."""
+    when = _deadline.get()
+    return None if when is None else when - asyncio.get_running_loop().time()
+
+def _attempt_timeout() -> dict[str, aiohttp.ClientTimeout]:
+    """`timeout` argument bounding a single HTTP attempt by the current deadline, if any."""
+    remaining = _remaining()
+    return {} if remaining is None else {"timeout": aiohttp.ClientTimeout(total=max(remaining, 0.001))}
+
+
+class AdaptiveConcurrency():
+    """Limits requests in flight, adapting the limit to how SRC is coping (additive increase, multiplicative decrease).
+
+    While the limit is in use and requests succeed without slowing down, it grows by roughly 1 per round of requests.
+    It is cut by `backoff` on a 5xx, 408 or 429 response, a connection failure, or when the p95 latency of the last `window`
+    requests exceeds `latency_tolerance` times its baseline. At most one cut is made per round of requests, so a burst
+    of failures from requests already in flight only counts once.
+    
+    Waiters are futures created on acquire, so no asyncio primitives are bound at construction."""
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, backoff: float = 0.5,
+                 latency_tolerance: float = 2.0, window: int = 100) -> None:
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.baseline: float | None = None
+        """Smoothed low p95 latency, against which rises are measured."""
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._last_cut = 0.0
+        self._since_p95 = 0
+    
+    async def acquire(self, priority: Priority = Priority.NORMAL):
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Woken but cancelled before running; pass the slot on
+                self.in_flight -= 1
+            self._wake()
+            raise
+    
+    def release(self, latency: float, failed: bool, sample: bool = True):
+        """Return a slot, reporting the request's latency and whether SRC failed to handle it.
+
+        Without `sample` (eg. the attempt was cancelled or cut short by a deadline) the slot is returned without
+        affecting the limit, as the attempt says nothing about how SRC is coping."""
+        self.in_flight -= 1
+        if not sample:
+            self._wake()
+            return
+        if failed:
+            self._cut(latency)
+        else:
+            self._latencies.append(latency)
+            self._since_p95 += 1
+            if self._since_p95 >= max(self._latencies.maxlen // 10, 1):  # type: ignore
+                self._since_p95 = 0
+                self._check_latency(latency)
+            if self.in_flight + 1 >= int(self.limit):
+                self.limit = min(self.limit + 1 / self.limit, self.maximum)
+        self._wake()
+    
+    def p95(self) -> float | None:
+        if not self._latencies: return None
+        ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    
+    def _check_latency(self, latency: float):
+        p95 = self.p95()
+        if p95 is None or len(self._latencies) < self._latencies.maxlen // 2:  # type: ignore
+            return
+        if self.baseline is None or p95 < self.baseline:
+            self.baseline = p95
+        elif p95 > self.baseline * self.latency_tolerance:
+            self._cut(latency)
+        else:
+            # Let the baseline drift upwards slowly, so a permanent change in SRC's speed is eventually accepted
+            self.baseline += (p95 - self.baseline) * 0.05
+    
+    def _cut(self, latency: float):
+        now = time.monotonic()
+        if now - self._last_cut < latency: return
+        self._last_cut = now
+        self.limit = max(self.limit * self.backoff, self.minimum)
+    
+    def _wake(self):
+        while self._waiters and (self._waiters[0][2].done() or self.in_flight < int(self.limit)):
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done(): continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+
+TRANSIENT = (RateLimitExceeded, RequestTimeout, ServerException, aiohttp.ClientError, asyncio.TimeoutError)
+"""Failures that may not recur if a request is repeated."""
+
+
+class CircuitBreaker():
+    """Stops a client sending requests while SRC is failing.
+
+    After `threshold` consecutive 5xx, 408 or connection failures the circuit opens: requests raise `CircuitOpen`
+    immediately (or are served stale from the client's `response_cache`, if it holds the response). After `cooldown`
+    seconds, up to `probes` requests at a time are let through; the circuit closes on the first success, and opens for
+    another `cooldown` on a failure. Retries within `perform` are also refused while open, so they stop hammering SRC.
+
+    Holds no asyncio primitives, so may be shared across event loops."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30, probes: int = 1) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.probes = probes
+        self.state = self.CLOSED
+        self.failures = 0
+        """Consecutive failures while closed."""
+        self._opened = 0.0
+        self._probing = 0
+
+    def before(self) -> bool:
+        """Check a request may be sent, raising `CircuitOpen` if not. Returns whether the request is a probe."""
+        if self.state == self.CLOSED:
+            return False
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened < self.cooldown:
+                raise CircuitOpen(f"SRC is failing; retry after {self.cooldown - (time.monotonic() - self._opened):.1f}s")
+            self.state = self.HALF_OPEN
+        if self._probing >= self.probes:
+            raise CircuitOpen("SRC is failing; waiting on probe requests")
+        self._probing += 1
+        return True
+
+    def after(self, outage: bool | None, probe: bool):
+        """Record the outcome of a request; `outage` is None if it did not complete."""
+        if probe:
+            self._probing -= 1
+        if outage is None:
+            return
+        if not outage:
+            self.failures = 0
+            if probe: self.state = self.CLOSED
+            return
+        self.failures += 1
+        if probe or (self.state == self.CLOSED and self.failures >= self.threshold):
+            self.state = self.OPEN
+            self._opened = time.monotonic()
+
+
+class HedgePolicy():
+    """Sends a duplicate of a slow GET request, using whichever response arrives first.
+
+    A hedge is sent once the first attempt has taken longer than the `percentile` latency of recent requests to the same
+    endpoint (`delay` until `min_samples` have been seen). Latency is timed from the first attempt, so hedged requests
+    still count their stall. Extra load is capped: each request earns `max_extra` of a hedge, up to `burst` saved,
+    and each hedge spends one, so at most `max_extra` of requests are hedged in the long run.
+
+    - @endpoints: Names of endpoints to hedge, eg. `{"GetGameSummary", "GetRun"}`. If None, every GET request is hedged."""
+    def __init__(self, endpoints: Iterable[str] | None = None, percentile: float = 0.95, max_extra: float = 0.05,
+                 burst: float = 5, delay: float = 1, min_samples: int = 20, window: int = 200) -> None:
+        self.endpoints = None if endpoints is None else frozenset(endpoints)
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.burst = burst
+        self.delay = delay
+        self.min_samples = min_samples
+        self.window = window
+        self.hedged = 0
+        self.wins = 0
+        """Hedges that answered before the first attempt."""
+        self._tokens = burst
+        self._latencies: dict[str, deque[float]] = {}
+
+    def applies(self, endpoint: str) -> bool:
+        return self.endpoints is None or endpoint in self.endpoints
+
+    def hedge_after(self, endpoint: str) -> float:
+        """Seconds after which a request to `endpoint` is hedged."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.delay
+        ordered = sorted(latencies)
+        return ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+
+    def record(self, endpoint: str, latency: float):
+        self._latencies.setdefault(endpoint, deque(maxlen=self.window)).append(latency)
+
+    def earn(self):
+        self._tokens = min(self._tokens + self.max_extra, self.burst)
+
+    def spend(self) -> bool:
+        """Take the budget for one hedge, if available."""
+        if self._tokens < 1: return False
+        self._tokens -= 1
+        self.hedged += 1
+        return True
+
+
 class SpeedrunClient():
     """Api class. Holds a unique PHPSESSID and user_agent, as well as its own logger."""
     
@@ -30,10 +366,38 @@ class SpeedrunClient():
     loose_cookies: dict[str, str]
     """Cookies before jar construction."""
     _header: dict[str, str]
+    parse_cache: ParseCache | None
+    """Optional cache of validated responses, shared by all requests made with this client."""
+    entity_store: EntityStore | None
+    """Optional identity map; every response is normalised into it."""
+    rate_limiter: RateLimiter | None
+    """Optional limit on requests per second, shared by all requests made with this client."""
+    response_cache: ResponseCache | None
+    """Optional cache of GET responses by request, invalidated by entity changes."""
+    concurrency: AdaptiveConcurrency | None
+    """Optional limit on requests in flight, shared by all requests made with this client."""
+    circuit_breaker: CircuitBreaker | None
+    """Optional breaker refusing requests while SRC is failing."""
+    hedge: HedgePolicy | None
+    """Optional policy duplicating slow GET requests."""
+    page_planner: PagePlanner | None
+    """Optional record of page counts, letting `perform_all` fetch every page at once."""
     
-    def __init__(self, user_agent: str | None = None, PHPSESSID: str | None = None) -> None:
+    def __init__(self, user_agent: str | None = None, PHPSESSID: str | None = None,
+                 parse_cache: ParseCache | None = None, entity_store: EntityStore | None = None,
+                 rate_limiter: RateLimiter | None = None, response_cache: ResponseCache | None = None,
+                 concurrency: AdaptiveConcurrency | None = None, circuit_breaker: CircuitBreaker | None = None,
+                 hedge: HedgePolicy | None = None, page_planner: PagePlanner | None = None) -> None:
         self.cookie_jar = None
         self._session = None
+        self.parse_cache = parse_cache
+        self.entity_store = entity_store
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.concurrency = concurrency
+        self.circuit_breaker = circuit_breaker
+        self.hedge = hedge
+        self.page_planner = page_planner
         self.loose_cookies = {}
         if PHPSESSID is not None:
             self.loose_cookies["PHPSESSID"] = PHPSESSID
@@ -77,7 +441,22 @@ class SpeedrunClient():
         paramsjson = bytes(json.dumps(params, separators=(",", ":"), cls=ModelEncoder).strip(), "utf-8")
         return base64.urlsafe_b64encode(paramsjson).replace(b"=", b"").decode()
 
-    async def GET(self, endpoint: str, params: dict = {}) -> tuple[bytes, int]:
+    @staticmethod
+    async def _read(response: aiohttp.ClientResponse) -> bytearray:
+        """Reads a response body in chunks into a single buffer, enforcing `config.max_response_size`.
+        
+        The buffer is handed to pydantic as-is, so the body is never copied into a `bytes` or decoded into a `str`."""
+        limit = config.max_response_size
+        if response.content_length is not None and response.content_length > limit:
+            raise ResponseTooLarge(f"Response of {response.content_length} bytes exceeds max_response_size {limit}")
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(config.read_chunk_size):
+            body += chunk
+            if len(body) > limit:
+                raise ResponseTooLarge(f"Response exceeded max_response_size {limit}")
+        return body
+
+    async def GET(self, endpoint: str, params: dict = {}) -> tuple[bytearray, int]:
         self._log.debug(f"GET {endpoint} w/ params {params}")
         
         session: aiohttp.ClientSession | None = self._session
@@ -85,8 +464,9 @@ class SpeedrunClient():
             session = await (await self._construct_session()).__aenter__()
         
         try:
-            async with session.get(url=f"{API_ROOT}{endpoint}", params={"_r": self._encode_r(params)}) as response:
-                out = (await response.read(), response.status)
+            async with session.get(url=f"{API_ROOT}{endpoint}", params={"_r": self._encode_r(params)},
+                                   **_attempt_timeout()) as response:
+                out = (await self._read(response), response.status)
         except Exception as e:
             raise e
         else:
@@ -95,7 +475,7 @@ class SpeedrunClient():
             if self._session is None:
                 await session.__aexit__(*sys.exc_info())
     
-    async def POST(self, endpoint: str, params: dict = {}) -> tuple[bytes, int]:
+    async def POST(self, endpoint: str, params: dict = {}) -> tuple[bytearray, int]:
         self._log.debug(f"POST {endpoint} w/ params {params}")
         
         session = self._session
@@ -103,8 +483,8 @@ class SpeedrunClient():
             session = await (await self._construct_session()).__aenter__()
         
         try:
-            async with session.post(url=f"{API_ROOT}{endpoint}", json=params) as response:
-                out = (await response.read(), response.status)
+            async with session.post(url=f"{API_ROOT}{endpoint}", json=params, **_attempt_timeout()) as response:
+                out = (await self._read(response), response.status)
         except Exception as e:
             raise e
         else:
@@ -124,6 +504,11 @@ def set_default_PHPSESSID(phpsessionid):
 R = TypeVar('R', bound=SpeedrunModel)
 
 
+def _preview(content: bytes | bytearray, length: int = 200) -> str:
+    """Short repr of a response body for logging."""
+    return repr(bytes(content[:length])) + ("..." if len(content) > length else "")
+
+
 class BaseRequest(Generic[R]):
     method_name: ClassVar[str]
     endpoint: ClassVar[str]
@@ -140,25 +525,61 @@ class BaseRequest(Generic[R]):
         """Updates parameters using values set in kwargs"""
         self.params.update(kwargs)
 
-    async def perform(self, retries=5, delay=1, autovary=False, **kwargs) -> R:
-        """Asynchronously perform the request. Remember to `await` me!"""
+    async def perform(self, retries=5, delay=1, autovary=False, timeout: float | None = None, **kwargs) -> R:
+        """Asynchronously perform the request. Remember to `await` me!
+        
+        With `timeout`, raises `TimeoutError` if the request (including retries) has not completed in `timeout` seconds."""
+        if timeout is not None:
+            async with deadline(timeout):
+                return await self.perform(retries, delay, autovary, **kwargs)
         if autovary is True: kwargs |= {"vary": random.randint(1, 1000000000)}
-        method = getattr(self.client, self.method_name)
+        params = self.params | kwargs
         
-        self.response = await method(self.endpoint, self.params | kwargs)
+        cache = self.client.response_cache if self.method_name == "GET" and not params.get("vary") else None
+        if cache is None or not cache.accepts(self.endpoint):
+            return await self._perform(params, retries, delay)
+        
+        key = fingerprint(self.endpoint, params)
+        for tag in cache.due(key):
+            await self._revalidate(cache, tag)
+        cached = cache.get(key)
+        if cached is not None: return cached  # type: ignore
+        try:
+            result = await self._perform(params, retries, delay)
+        except CircuitOpen:
+            stale = cache.get_stale(key)
+            if stale is None: raise
+            _log.warning(f"Circuit open, serving stale {self.endpoint} from cache")
+            return stale  # type: ignore
+        cache.put(key, self.endpoint, params, result)
+        return result
+    
+    async def _revalidate(self, cache: ResponseCache, tag: tuple[str, str]):
+        """Fetch the current version of a tagged entity, invalidating cached responses based on an older one."""
+        probe = cache.probe(tag, _client=self.client)
+        try:
+            result = await probe._perform(probe.params, 0, 0)
+        except Exception as e:
+            _log.warning(f"Could not revalidate {tag[0]} {tag[1]}: {e!r}")
+            return
+        cache.put(fingerprint(probe.endpoint, probe.params), probe.endpoint, probe.params, result)
+    
+    async def _perform(self, params: dict[str, Any], retries: int, delay: float) -> R:
+        """Perform the request with retries, bypassing any response cache."""
+        self.response = await self._attempt(params)
         content = self.response[0]
         status = self.response[1]
 
         if (status >= 500 and status <= 599) or status == 408:
             if retries > 0:
-                _log.error(f"SRC returned error {status} {content!r}. Retrying with delay {delay}:")
+                _log.error(f"SRC returned error {status} {_preview(content)}. Retrying with delay {delay}:")
                 for attempt in range(0, retries + 1):
-                    self.response = await method(self.endpoint, self.params | kwargs)
+                    self.response = await self._attempt(params)
                     content = self.response[0]
                     status = self.response[1]
                     if not (status >= 500 and status <= 599) or status == 408:
                         break
-                    _log.error(f"Retry {attempt} returned error {status} {content!r}")
+                    _log.error(f"Retry {attempt} returned error {status} {_preview(content)}")
                     await asyncio.sleep(delay)
                 else:
                     if status == 408: raise RequestTimeout(self)
@@ -176,17 +597,101 @@ class BaseRequest(Generic[R]):
         if (status >= 500 and status <= 599): raise ServerException(self)
 
         if status < 200 or status > 299:
-            _log.error(f"Unknown response error returned from SRC! {status} {self.response[0]!r}")
+            _log.error(f"Unknown response error returned from SRC! {status} {_preview(content)}")
             raise APIException(self)
         
-        return self.return_type.model_validate_json(content.decode(), strict=config.strict_mode)
+        return self._parse(content)
+    
+    async def _attempt(self, params: dict[str, Any]) -> tuple[bytearray, int]:
+        """Make one attempt at the request, hedged if the client's `HedgePolicy` applies."""
+        policy = self.client.hedge
+        if policy is None or self.method_name != "GET" or not policy.applies(self.endpoint):
+            return await self._call(params)
+        
+        policy.earn()
+        start = time.monotonic()
+        first = asyncio.ensure_future(self._call(params))
+        attempts = [first]
+        try:
+            done, _ = await asyncio.wait((first,), timeout=policy.hedge_after(self.endpoint))
+            if not done and policy.spend():
+                attempts.append(asyncio.ensure_future(self._call(params)))
+            
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer an answer from SRC; fall back to a failure once every attempt has failed
+                answered = [t for t in done if not t.cancelled() and t.exception() is None and t.result()[1] < 500]
+                if answered:
+                    # Timed from the request's start, so stalled first attempts that lose still count towards the tail
+                    policy.record(self.endpoint, time.monotonic() - start)
+                if answered or not pending:
+                    winner = answered[0] if answered else (first if first in done else next(iter(done)))
+                    if winner is not first: policy.wins += 1
+                    return winner.result()
+        finally:
+            for task in attempts:
+                task.cancel()
     
-    def perform_sync(self, retries=5, delay=1, autovary=False, **kwargs) -> R:
+    async def _call(self, params: dict[str, Any]) -> tuple[bytearray, int]:
+        """Make a single HTTP attempt through the client, respecting its circuit breaker, concurrency & rate limits."""
+        breaker, concurrency = self.client.circuit_breaker, self.client.concurrency
+        level = _priority.get()
+        if level is None: level = Priority.NORMAL
+        if breaker is None and concurrency is None:
+            if self.client.rate_limiter is not None:
+                await self.client.rate_limiter.acquire(level)
+            return await getattr(self.client, self.method_name)(self.endpoint, params)
+        
+        probe = False if breaker is None else breaker.before()
+        outage: bool | None = None
+        """Whether SRC failed to handle the request; None if the attempt did not complete (eg. cancelled)."""
+        failed = False
+        acquired = False
+        start = time.monotonic()
+        try:
+            if concurrency is not None:
+                await concurrency.acquire(level)
+                acquired = True
+            if self.client.rate_limiter is not None:
+                await self.client.rate_limiter.acquire(level)
+            start = time.monotonic()
+            response = await getattr(self.client, self.method_name)(self.endpoint, params)
+            status = response[1]
+            outage = status >= 500 or status == 408
+            failed = outage or status == 429
+            return response
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            remaining = _remaining()
+            if remaining is None or remaining > 0:
+                outage = failed = True
+            # Otherwise the deadline cut the attempt short, so it did not complete
+            raise
+        finally:
+            if acquired:
+                concurrency.release(time.monotonic() - start, failed, sample=outage is not None)  # type: ignore
+            if breaker is not None:
+                breaker.after(outage, probe)
+    
+    def _parse(self, content: bytes | bytearray) -> R:
+        """Validate a raw response body straight from bytes, without decoding to `str` first.
+        
+        If the client has a `parse_cache`, unchanged bodies return the previously validated model.
+        If the client has an `entity_store`, the result is normalised into it."""
+        if self.client.parse_cache is not None:
+            result = self.client.parse_cache.parse(self.endpoint, self.return_type, content)
+        else:
+            result = self.return_type.model_validate_json(content, strict=config.strict_mode)
+        if self.client.entity_store is not None:
+            self.client.entity_store.normalize(result)
+        return result
+    
+    def perform_sync(self, retries=5, delay=1, autovary=False, timeout: float | None = None, **kwargs) -> R:
         """Synchronously perform the request.
         
         NB: This uses its own event loop, so if using `asyncio` use `perform_async()` instead."""
         try:
-            return asyncio.run(self.perform(retries, delay, autovary, **kwargs))
+            return asyncio.run(self.perform(retries, delay, autovary, timeout, **kwargs))
         except RuntimeError:
             raise AIOException("Synchronous interface called from asynchronous context - use `await perform_async` instead.") from None
     
@@ -197,36 +702,191 @@ class BasePaginatedRequest(BaseRequest[R], Generic[R]):
         """Locates the pagination object on a response. Overriden on certain subclasses."""
         return getattr(p, "pagination")
     
-    def perform_all_sync(self, retries=5, delay=1, autovary=False, max_pages=0, **kwargs) -> R:
+    def perform_all_sync(self, retries=5, delay=1, autovary=False, max_pages=0, stop_when: Callable[[R], bool] | None = None,
+                         timeout: float | None = None, partial=False, **kwargs) -> R:
         """Returns a combined dict of all pages. `pagination` is removed."""
-        pages = self._perform_all_raw_sync(retries, delay, autovary, max_pages, **kwargs)
+        pages = self._perform_all_raw_sync(retries, delay, autovary, max_pages, stop_when, timeout, partial, **kwargs)
         return self._combine_pages(pages.values())
     
-    def _perform_all_raw_sync(self, retries=5, delay=1, autovary=False, max_pages=0, **kwargs) -> dict[int, R]:
+    def _perform_all_raw_sync(self, retries=5, delay=1, autovary=False, max_pages=0, stop_when: Callable[[R], bool] | None = None,
+                              timeout: float | None = None, partial=False, **kwargs) -> dict[int, R]:
         """Get all pages and return a dict of {pageNo : pageData}."""
         try:
-            return asyncio.run(self._perform_all_raw(retries, delay, autovary, max_pages, **kwargs))
+            return asyncio.run(self._perform_all_raw(retries, delay, autovary, max_pages, stop_when, timeout, partial, **kwargs))
         except RuntimeError:
             raise AIOException("Synchronous interface called from asynchronous context - use `await perform_async` instead.") from None
     
-    async def perform_all(self, retries=5, delay=1, autovary=False, max_pages=0, **kwargs) -> R:
-        """Returns a combined dict of all pages. `pagination` is removed."""
-        pages = await self._perform_all_raw(retries, delay, autovary, max_pages, **kwargs)
+    async def perform_all(self, retries=5, delay=1, autovary=False, max_pages=0, stop_when: Callable[[R], bool] | None = None,
+                          timeout: float | None = None, partial=False, **kwargs) -> R:
+        """Returns a combined dict of all pages. `pagination` is removed.
+        
+        If `stop_when(page)` returns True, no pages after that page are fetched; see `_perform_all_raw`.
+        `timeout` & `partial` bound the time taken; see `_perform_all_raw`."""
+        pages = await self._perform_all_raw(retries, delay, autovary, max_pages, stop_when, timeout, partial, **kwargs)
         return self._combine_pages(pages.values())
     
-    async def _perform_all_raw(self, retries=5, delay=1, autovary=False, max_pages=0, **kwargs) -> dict[int, R]:
-        """Get all pages and return a dict of {pageNo : pageData}."""
+    async def _perform_all_raw(self, retries=5, delay=1, autovary=False, max_pages=0, stop_when: Callable[[R], bool] | None = None,
+                               timeout: float | None = None, partial=False, **kwargs) -> dict[int, R]:
+        """Get all pages and return a dict of {pageNo : pageData}.
+        
+        Without `stop_when`, all pages after the first are fetched simultaneously. With `stop_when`, pages are fetched in order
+        until `stop_when(page)` returns True for a page, which is kept; eg. to stop at entries older than the last sync:
+        `stop_when=lambda p: p.auditLogList[-1].date < last_sync`.
+        
+        With `timeout`, fetches still running after `timeout` seconds are cancelled and `TimeoutError` is raised; or, if
+        `partial`, the pages fetched so far are returned (`TimeoutError` is still raised if the first page was not fetched)."""
         self.pages: dict[int, R] = {}
+        if timeout is not None:
+            try:
+                async with deadline(timeout):
+                    await self._perform_all_raw(retries, delay, autovary, max_pages, stop_when, **kwargs)
+            except TimeoutError:
+                # Speculative pages (see `PagePlanner`) may arrive without page 1, or lie past the real end
+                if not partial or 1 not in self.pages: raise
+                # An empty list reports 0 pages, but page 1 still holds the (empty) result
+                numpages = max(self._get_pagination(self.pages[1]).pages, 1)
+                if max_pages >= 1:
+                    numpages = min(numpages, max_pages)
+                self.pages = {p: page for p, page in self.pages.items() if p <= numpages}
+                _log.warning(f"{self.endpoint} timed out after {timeout}s, returning {len(self.pages)} pages")
+            self.pages = dict(sorted(self.pages.items()))
+            return self.pages
+        if stop_when is not None:
+            async for p, page in self.iter_pages(retries, delay, autovary, max_pages, concurrency=1, stop_when=stop_when, **kwargs):
+                self.pages[p] = page
+            return self.pages
         vary = 0 if not autovary else random.randint(1, 1000000000)
+        if self.client.page_planner is not None:
+            return await self._perform_all_planned(self.client.page_planner, retries, delay, vary, max_pages, **kwargs)
         self.pages[1] = await self.perform(retries, delay, page=1, vary=vary, **kwargs)
         numpages: int = self._get_pagination(self.pages[1]).pages
         if max_pages >= 1:
             numpages = min(numpages, max_pages)
         if numpages > 1:
-            results = await asyncio.gather(*[self.perform(retries, delay, vary=vary, page=p, **kwargs) for p in range(2, numpages + 1)])
-            self.pages.update({p + 2: result for p, result in enumerate(results)})
+            pages = self.pages
+            async def fetch(p: int):
+                pages[p] = await self.perform(retries, delay, vary=vary, page=p, **kwargs)
+            # The first page to fail cancels the rest, rather than leaving them running
+            try:
+                async with asyncio.TaskGroup() as group:
+                    for p in range(2, numpages + 1):
+                        _bulk_task(fetch(p), group)
+            except BaseExceptionGroup as e:
+                raise e.exceptions[0] from None
+            self.pages = dict(sorted(pages.items()))
         return self.pages
     
+    async def _perform_all_planned(self, planner: PagePlanner, retries, delay, vary, max_pages, **kwargs) -> dict[int, R]:
+        """Fetch page 1 together with the pages `planner` expects, then reconcile with the real page count."""
+        key = fingerprint(self.endpoint, self.params | kwargs)
+        guess = planner.guess(key)
+        if max_pages >= 1:
+            guess = min(guess, max_pages)
+        pages = self.pages
+        counted: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        
+        async def fetch(p: int):
+            pages[p] = await self.perform(retries, delay, vary=vary, page=p, **kwargs)
+        
+        async def speculate(p: int):
+            try:
+                await fetch(p)
+            except Exception:
+                # A page that turns out not to exist may fail; that is no reason to fail the whole request
+                if p <= await counted: raise
+        
+        try:
+            async with asyncio.TaskGroup() as group:
+                speculative = {p: _bulk_task(speculate(p), group) for p in range(2, guess + 1)}
+                await fetch(1)
+                total = self._get_pagination(pages[1]).pages
+                planner.record(key, total)
+                numpages = max(total if max_pages < 1 else min(total, max_pages), 1)
+                counted.set_result(numpages)
+                for p, task in speculative.items():
+                    if p > numpages: task.cancel()
+                for p in range(guess + 1, numpages + 1):
+                    _bulk_task(fetch(p), group)
+        except BaseExceptionGroup as e:
+            raise e.exceptions[0] from None
+        finally:
+            counted.cancel()
+        
+        for p in [p for p in pages if p > numpages]:
+            del pages[p]
+        planner.wasted += max(guess - numpages, 0)
+        self.pages = dict(sorted(pages.items()))
+        return self.pages
+    
+    async def perform_all_tolerant(self, retries=5, delay=1, autovary=False, max_pages=0, page_retries=2,
+                                   **kwargs) -> tuple[dict[int, R], dict[int, Exception]]:
+        """Get all pages, returning `(pages, failures)` as {pageNo : pageData} & {pageNo : error} instead of raising on a failed page.
+        
+        Pages that fail transiently (see `TRANSIENT`) are retried, without refetching pages that succeeded, for up to
+        `page_retries` further rounds, waiting `delay * 2**n` seconds before the nth. Other errors are not retried.
+        The first page gives the number of pages, so errors on it are raised."""
+        self.pages: dict[int, R] = {}
+        vary = 0 if not autovary else random.randint(1, 1000000000)
+        self.pages[1] = await self.perform(retries, delay, page=1, vary=vary, **kwargs)
+        numpages: int = self._get_pagination(self.pages[1]).pages
+        if max_pages >= 1:
+            numpages = min(numpages, max_pages)
+        
+        failures: dict[int, Exception] = {}
+        todo = list(range(2, numpages + 1))
+        for round in range(page_retries + 1):
+            if not todo: break
+            if round > 0:
+                _log.warning(f"Retrying {len(todo)} failed pages of {self.endpoint}")
+                await asyncio.sleep(delay * 2 ** (round - 1))
+            results = await asyncio.gather(*[_bulk_task(self.perform(retries, delay, vary=vary, page=p, **kwargs)) for p in todo],
+                                           return_exceptions=True)
+            failed = []
+            for p, result in zip(todo, results):
+                if isinstance(result, Exception):
+                    failures[p] = result
+                    if isinstance(result, TRANSIENT): failed.append(p)
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    failures.pop(p, None)
+                    self.pages[p] = result
+            todo = failed
+        self.pages = dict(sorted(self.pages.items()))
+        return self.pages, failures
+    
+    async def iter_pages(self, retries=5, delay=1, autovary=False, max_pages=0, concurrency=4, start_page=1,
+                         stop_when: Callable[[R], bool] | None = None, **kwargs) -> AsyncIterator[tuple[int, R]]:
+        """Yield `(pageNo, pageData)` in page order, keeping at most `concurrency` requests in flight.
+        
+        Unlike `perform_all`, pages are not retained, so memory use does not grow with the number of pages.
+        Use `start_page` to resume a previous iteration.
+        If `stop_when(page)` returns True, that page is the last yielded; requests already in flight for later pages are cancelled."""
+        vary = 0 if not autovary else random.randint(1, 1000000000)
+        first = await self.perform(retries, delay, page=start_page, vary=vary, **kwargs)
+        numpages: int = self._get_pagination(first).pages
+        if max_pages >= 1:
+            numpages = min(numpages, max_pages)
+        stop = stop_when is not None and stop_when(first)
+        yield start_page, first
+        del first
+        if stop: return
+        
+        pending: deque[tuple[int, asyncio.Future[R]]] = deque()
+        next_page = start_page + 1
+        try:
+            while pending or next_page <= numpages:
+                while next_page <= numpages and len(pending) < max(concurrency, 1):
+                    pending.append((next_page, _bulk_task(self.perform(retries, delay, page=next_page, vary=vary, **kwargs))))
+                    next_page += 1
+                page, task = pending.popleft()
+                result = await task
+                yield page, result
+                if stop_when is not None and stop_when(result): return
+        finally:
+            for _, task in pending:
+                task.cancel()
+    
     @classmethod 
     # This isn't static to allow overriding for a single case (GetGameLeaderboard) that nests results one level deep.
     def _combine_pages(cls, responses: Iterable[R]):
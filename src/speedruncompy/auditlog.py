@@ -0,0 +1,223 @@
+"""Tail the audit logs of games & series, emitting typed change events.
+
+Each poll requests only entries newer than a cursor, the date & ids of the newest entry already seen. Pagination stops at
+the first page reaching the cursor, so a quiet game costs one request per poll:
+```python
+tailer = AuditLogTailer(gameIds=["76rqmld8"])
+async for event in tailer.watch(interval=60):
+    if isinstance(event, RunEvent) and event.run is not None:
+        ...
+```
+Entities an entry refers to are resolved through the response's condensers; an entity may be `None` if it has since been deleted.
+
+If more than `max_pages` pages of entries arrive between polls of a source, the older entries are not read; an `AuditGap`
+is emitted in their place, so consumers (eg. `cache.ResponseCache.on_event`) can resync that source.
+
+Cursors may be saved from `AuditLogTailer.cursors` and passed back on construction to resume after a restart, or kept in a
+`checkpoint.Checkpoint`, to which `watch` saves them once each poll's events have been handled.
+Without a cursor, a source's first poll only records its newest entry, so tailing starts from the present.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, ClassVar, Iterable
+
+from .api import SpeedrunClient
+from .checkpoint import Checkpoint
+from .datatypes import AuditLogEntry, Category, Game, Level, Run, User, Value, Variable
+from .datatypes.responses import r_GetAuditLogList
+from .endpoints import GetAuditLogList
+
+_log = logging.getLogger("speedruncompy.auditlog")
+
+Cursor = tuple[int, list[str]]
+"""`(date, entryIds)` of the newest entries seen from a source."""
+
+
+class AuditEvent():
+    """An audit log entry, with the entities it refers to resolved.
+
+    Subclasses are chosen by the prefix of `eventType`; unrecognised event types produce a plain `AuditEvent`."""
+    prefix: ClassVar[str] = ""
+
+    def __init__(self, entry: AuditLogEntry, page: r_GetAuditLogList) -> None:
+        self.entry = entry
+        self.context: dict[str, Any] = _load_context(entry.context)
+        self.actor: User | None = page._userDict.get(entry.actorId)
+        self.user: User | None = None if entry.userId is None else page._userDict.get(entry.userId)
+        self.game: Game | None = page._gameDict.get(entry.gameId)
+        self.run: Run | None = _resolve(page._runDict, self.context.get("runId"))
+        self.category: Category | None = _resolve(page._categoryDict, self.context.get("categoryId"))
+        self.level: Level | None = _resolve(page._levelDict, self.context.get("levelId"))
+        self.variable: Variable | None = _resolve(page._variableDict, self.context.get("variableId"))
+        self.value: Value | None = _resolve(page._valueDict, self.context.get("valueId"))
+
+    @property
+    def id(self) -> str:
+        return self.entry.id
+
+    @property
+    def date(self) -> int:
+        return self.entry.date
+
+    @property
+    def eventType(self) -> str:
+        return self.entry.eventType
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.eventType!r}, id={self.id!r}, date={self.date})"
+
+class RunEvent(AuditEvent):
+    prefix = "run-"
+
+class CategoryEvent(AuditEvent):
+    prefix = "category-"
+
+class LevelEvent(AuditEvent):
+    prefix = "level-"
+
+class VariableEvent(AuditEvent):
+    prefix = "variable-"
+
+class ValueEvent(AuditEvent):
+    prefix = "value-"
+
+class CommentEvent(AuditEvent):
+    prefix = "comment-"
+
+class ModeratorEvent(AuditEvent):
+    prefix = "game-moderator-"
+
+class NewsEvent(AuditEvent):
+    prefix = "game-news-post-"
+
+class GameEvent(AuditEvent):
+    prefix = "game-"
+
+EVENT_TYPES: tuple[type[AuditEvent], ...] = (RunEvent, CategoryEvent, LevelEvent, VariableEvent, ValueEvent, CommentEvent,
+                                             ModeratorEvent, NewsEvent, GameEvent)
+"""Event classes in matching order; more specific prefixes come first."""
+
+
+class AuditGap():
+    """Stands in for entries of a source that were not read, because more than `max_pages` pages arrived between polls.
+
+    The missing entries are dated between `after` (the previous cursor) and `before` (the oldest entry read)."""
+    eventType = "gap"
+
+    def __init__(self, kind: str, sourceId: str, after: int, before: int) -> None:
+        self.kind = kind
+        """`gameId` or `seriesId`"""
+        self.sourceId = sourceId
+        self.after = after
+        self.before = before
+
+    @property
+    def date(self) -> int:
+        return self.before
+
+    def __repr__(self) -> str:
+        return f"AuditGap({self.kind}={self.sourceId!r}, after={self.after}, before={self.before})"
+
+
+def _load_context(context: str) -> dict[str, Any]:
+    try:
+        loaded = json.loads(context) if context else {}
+    except json.JSONDecodeError:
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+def _resolve(condenser: dict[str, Any], id: Any) -> Any:
+    return condenser.get(id) if isinstance(id, str) else None
+
+
+def make_event(entry: AuditLogEntry, page: r_GetAuditLogList) -> AuditEvent:
+    """Build the typed event for an entry of `page`."""
+    for event_t in EVENT_TYPES:
+        if entry.eventType.startswith(event_t.prefix):
+            return event_t(entry, page)
+    return AuditEvent(entry, page)
+
+
+def _is_new(entry: AuditLogEntry, cursor: Cursor | None) -> bool:
+    if cursor is None: return True
+    date, ids = cursor
+    return entry.date > date or (entry.date == date and entry.id not in ids)
+
+
+class AuditLogTailer():
+    """Polls the audit logs of a set of games & series for new entries.
+
+    `max_pages` bounds the pages read from a source in one poll, should it fall far behind; entries beyond it are
+    reported by an `AuditGap`.
+    Cursors stored in `checkpoint` take precedence over those passed as `cursors`. When calling `poll` directly, call
+    `save` once its events have been handled."""
+    def __init__(self, gameIds: Iterable[str] = (), seriesIds: Iterable[str] = (), _client: SpeedrunClient | None = None,
+                 cursors: dict[str, Cursor] | None = None, max_pages: int = 10, checkpoint: Checkpoint | None = None) -> None:
+        self._client = _client
+        self.sources: list[tuple[str, str]] = [("gameId", g) for g in gameIds] + [("seriesId", s) for s in seriesIds]
+        self.cursors: dict[str, Cursor] = dict(cursors or {})
+        self.max_pages = max_pages
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            for _, id in self.sources:
+                stored = checkpoint.get(f"auditlog:{id}")
+                if stored is not None:
+                    self.cursors[id] = (stored[0], stored[1])
+
+    async def poll_source(self, kind: str, id: str) -> list[AuditEvent | AuditGap]:
+        """Poll one game or series, returning its new events oldest first."""
+        cursor = self.cursors.get(id)
+        request = GetAuditLogList(**{kind: id}, _client=self._client)
+        if cursor is None:
+            pages = {1: await request.perform()}
+        else:
+            cursor_date = cursor[0]
+            pages = await request._perform_all_raw(max_pages=self.max_pages, stop_when=lambda page: not page.auditLogList or
+                                                   page.auditLogList[-1].date <= cursor_date)
+
+        events: dict[str, AuditEvent | AuditGap] = {}
+        if cursor is not None:
+            last = pages[max(pages)]
+            reached = not last.auditLogList or last.auditLogList[-1].date <= cursor[0] or max(pages) >= last.pagination.pages
+            if not reached:
+                oldest = last.auditLogList[-1].date
+                _log.warning(f"Audit log of {kind} {id} has more than {self.max_pages} pages of new entries; "
+                             f"entries dated {cursor[0]} to {oldest} were not read")
+                events["gap"] = AuditGap(kind, id, cursor[0], oldest)
+        newest: list[AuditLogEntry] = []
+        for page in pages.values():
+            for entry in page.auditLogList:
+                if not newest or entry.date > newest[0].date:
+                    newest = [entry]
+                elif entry.date == newest[0].date:
+                    newest.append(entry)
+                if cursor is not None and entry.id not in events and _is_new(entry, cursor):
+                    events[entry.id] = make_event(entry, page)
+
+        if newest and (cursor is None or newest[0].date >= cursor[0]):
+            ids = [e.id for e in newest]
+            if cursor is not None and cursor[0] == newest[0].date:
+                ids = list(dict.fromkeys(cursor[1] + ids))
+            self.cursors[id] = (newest[0].date, ids)
+        return sorted(events.values(), key=lambda e: e.date)
+
+    async def poll(self) -> list[AuditEvent | AuditGap]:
+        """Poll every source once, returning all new events oldest first."""
+        results = await asyncio.gather(*(self.poll_source(kind, id) for kind, id in self.sources))
+        return sorted((event for events in results for event in events), key=lambda e: e.date)
+
+    def save(self):
+        """Store the current cursors to `checkpoint`, if set."""
+        if self.checkpoint is None: return
+        for id, cursor in self.cursors.items():
+            self.checkpoint.set(f"auditlog:{id}", cursor)
+
+    async def watch(self, interval: float = 60) -> AsyncIterator[AuditEvent | AuditGap]:
+        """Poll every `interval` seconds forever, yielding new events."""
+        while True:
+            for event in await self.poll():
+                yield event
+            self.save()
+            await asyncio.sleep(interval)
@@ -1,14 +1,28 @@
+import asyncio
+import json
 import logging
-from .exceptions import AuthException, NotFound
+import os
+from typing import Any, Coroutine, TypeVar
+
+from .exceptions import AIOException, AuthException, NotFound
 from .api import SpeedrunClient, _default
 from .endpoints import PutAuthLogin, PutAuthLogout, GetSession
 
 log = logging.getLogger("speedruncompy.auth")
 
-def login(username: str, pwd: str, _api: SpeedrunClient = _default, tokenEntry: bool = False):
-    """Quick workflow to set sessid using username & pwd. Will prompt for 2FA if tokenEntry is True, otherwise will return False."""
+T = TypeVar("T")
+
+def _run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
     try:
-        result = PutAuthLogin(username, pwd, _api=_api).perform_sync()
+        return asyncio.run(coroutine)
+    except RuntimeError:
+        coroutine.close()
+        raise AIOException("Synchronous interface called from asynchronous context - use the `_async` variant instead.") from None
+
+async def login_async(username: str, pwd: str, _client: SpeedrunClient = _default, tokenEntry: bool = False) -> bool:
+    """Log in using username & pwd. Will prompt for 2FA if tokenEntry is True, otherwise will return False."""
+    try:
+        result = await PutAuthLogin(username, pwd, _client=_client).perform()
     except NotFound:
         print("Password is incorrect!")
         return False
@@ -18,8 +32,8 @@ def login(username: str, pwd: str, _api: SpeedrunClient = _default, tokenEntry:
     if result.tokenChallengeSent:
         if tokenEntry:
             log.warning("2FA is enabled - Not logged in!")
-            key = input("Enter 2FA token: ")
-            result = PutAuthLogin(username, pwd, key, _api=_api).perform_sync()
+            key = await asyncio.to_thread(input, "Enter 2FA token: ")
+            result = await PutAuthLogin(username, pwd, key, _client=_client).perform()
             if result.loggedIn:
                 log.info("Logged in using 2fa")
                 return True
@@ -29,10 +43,10 @@ def login(username: str, pwd: str, _api: SpeedrunClient = _default, tokenEntry:
             log.info("2FA code required, not logged in.")
     return False
 
-def login_PHPSESSID(sessID: str, _api: SpeedrunClient = _default):
+async def login_PHPSESSID_async(sessID: str, _client: SpeedrunClient = _default) -> bool:
     """Login using PHPSESSID. Uses GetSession to check if session is logged in."""
-    _api.PHPSESSID = sessID
-    result = GetSession(_api=_api).perform_sync()
+    _client.PHPSESSID = sessID
+    result = await GetSession(_client=_client).perform()
     session = result.session
     if not session.signedIn or session.user is None:
         log.error("Provided PHPSESSID is not logged in - use speedruncompy.auth.login() instead")
@@ -40,14 +54,126 @@ def login_PHPSESSID(sessID: str, _api: SpeedrunClient = _default):
     log.info(f"Logged in as {session.user.name} using PHPSESSID")
     return True
 
-def logout(_api: SpeedrunClient = _default):
-    PutAuthLogout(_api=_api).perform_sync()
+async def logout_async(_client: SpeedrunClient = _default) -> bool:
+    await PutAuthLogout(_client=_client).perform()
     return True
 
-def get_CSRF(_api: SpeedrunClient = _default):
+async def get_CSRF_async(_client: SpeedrunClient = _default) -> str:
     """Get the csrfToken of the currently logged in user, required for some endpoints."""
-    result = GetSession(_api=_api).perform_sync()
+    result = await GetSession(_client=_client).perform()
     session = result.session
     if session is None or not session.signedIn:
         raise AuthException("Not logged in, cannot retrieve csrfToken")
     return session.csrfToken
+
+def login(username: str, pwd: str, _api: SpeedrunClient = _default, tokenEntry: bool = False):
+    """Quick workflow to set sessid using username & pwd. Will prompt for 2FA if tokenEntry is True, otherwise will return False."""
+    return _run_sync(login_async(username, pwd, _api, tokenEntry))
+
+def login_PHPSESSID(sessID: str, _api: SpeedrunClient = _default):
+    """Login using PHPSESSID. Uses GetSession to check if session is logged in."""
+    return _run_sync(login_PHPSESSID_async(sessID, _api))
+
+def logout(_api: SpeedrunClient = _default):
+    return _run_sync(logout_async(_api))
+
+def get_CSRF(_api: SpeedrunClient = _default):
+    """Get the csrfToken of the currently logged in user, required for some endpoints."""
+    return _run_sync(get_CSRF_async(_api))
+
+class CSRFToken():
+    """Caches the csrfToken of a client's session, so that it is fetched once rather than before every action.
+
+    Call `invalidate()` when a request using the token is rejected; the next `get()` fetches a new one."""
+    def __init__(self, _client: SpeedrunClient | None = None, token: str | None = None) -> None:
+        """`token` may be given to start from a known token, eg. `SessionStore.csrfToken`."""
+        self._client = _default if _client is None else _client
+        self._token: str | None = token
+        self._fetching: asyncio.Future[str] | None = None
+
+    async def get(self) -> str:
+        if self._token is not None:
+            return self._token
+        if self._fetching is None:
+            # Concurrent callers share one GetSession request
+            self._fetching = asyncio.ensure_future(self._fetch())
+        try:
+            return await asyncio.shield(self._fetching)
+        finally:
+            if self._fetching is not None and self._fetching.done():
+                self._fetching = None
+
+    async def _fetch(self) -> str:
+        self._token = await get_CSRF_async(self._client)
+        return self._token
+
+    def invalidate(self, token: str | None = None):
+        """Forget the cached token; if `token` is given, only if it is still the cached one."""
+        if token is None or token == self._token:
+            self._token = None
+
+
+class SessionStore():
+    """Persists a client's PHPSESSID & csrfToken in a JSON file, so that a process need not log in every time it starts.
+
+    ```python
+    store = SessionStore("session.json", _client=client)
+    if not await store.ensure(username, password):
+        raise SystemExit("Could not log in")
+    ```
+    The file holds a live session; it is created readable only by its owner."""
+    def __init__(self, path: str, _client: SpeedrunClient = _default) -> None:
+        self.path = path
+        self._client = _client
+        self.csrfToken: str | None = None
+
+    def load(self) -> dict[str, str] | None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) and isinstance(data.get("PHPSESSID"), str) else None
+
+    def save(self):
+        """Write the client's current PHPSESSID & the cached csrfToken to disk."""
+        tmp = f"{self.path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"PHPSESSID": self._client.PHPSESSID, "csrfToken": self.csrfToken}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        self.csrfToken = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def restore(self) -> bool:
+        """Load the stored session into the client and check it is still logged in with a single `GetSession`."""
+        data = self.load()
+        if data is None: return False
+        self._client.PHPSESSID = data["PHPSESSID"]
+        session = (await GetSession(_client=self._client).perform()).session
+        if session is None or not session.signedIn:
+            log.info("Stored session is no longer logged in")
+            return False
+        changed = session.csrfToken != data.get("csrfToken")
+        self.csrfToken = session.csrfToken
+        if changed: self.save()
+        return True
+
+    async def ensure(self, username: str | None = None, pwd: str | None = None, tokenEntry: bool = False) -> bool:
+        """Restore the stored session, logging in with `username` & `pwd` only if it is missing or expired."""
+        if await self.restore():
+            return True
+        if username is None or pwd is None:
+            return False
+        if not await login_async(username, pwd, self._client, tokenEntry):
+            return False
+        self.csrfToken = await get_CSRF_async(self._client)
+        self.save()
+        return True
+
+    def csrf(self) -> CSRFToken:
+        """A `CSRFToken` cache starting from the stored token."""
+        return CSRFToken(_client=self._client, token=self.csrfToken)
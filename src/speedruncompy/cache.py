@@ -0,0 +1,333 @@
+"""Caches for responses received from SRC."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable, TypeVar
+
+from .datatypes._impl import SpeedrunModel, ModelEncoder
+from . import config
+
+if TYPE_CHECKING:
+    from .api import BaseRequest, SpeedrunClient
+    from .auditlog import AuditEvent, AuditGap
+
+M = TypeVar("M", bound=SpeedrunModel)
+
+
+class ParseCache():
+    """LRU cache of validated responses, keyed by endpoint and a hash of the raw response body.
+
+    Attach to a client with `SpeedrunClient(parse_cache=ParseCache())`. Responses that are byte-identical
+    to one seen before skip pydantic validation entirely, which is most of the cost of a polled request.
+
+    By default cached models are shared between every caller that received the same body, so they must be treated
+    as frozen. Note that a client's `entity_store` writes to them: `EntityStore.normalize` replaces nested entities
+    with their canonical instances, and later updates are applied to those canonical instances in place.
+    Pass `copy=True` to give each caller its own deep copy instead, at some cost to the time saved."""
+
+    def __init__(self, maxsize: int = 256, endpoints: Iterable[str] | None = None, copy: bool = False) -> None:
+        """
+        - @maxsize: Maximum number of responses held.
+        - @endpoints: If provided, only responses from these endpoints are cached.
+        - @copy: Return a deep copy of the cached model, so callers may modify what they receive.
+        """
+        self.maxsize = maxsize
+        self.endpoints = None if endpoints is None else frozenset(endpoints)
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, bool, bytes], SpeedrunModel] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse(self, endpoint: str, model_t: type[M], content: bytes | bytearray) -> M:
+        """Return the cached model for this body, validating and caching it on a miss."""
+        if self.endpoints is not None and endpoint not in self.endpoints:
+            return model_t.model_validate_json(content, strict=config.strict_mode)
+
+        key = (endpoint, config.strict_mode, hashlib.blake2b(content, digest_size=16).digest())
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached.model_copy(deep=True) if self.copy else cached  # type: ignore
+
+        self.misses += 1
+        result = model_t.model_validate_json(content, strict=config.strict_mode)
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result.model_copy(deep=True) if self.copy else result
+
+    def clear(self):
+        self._entries.clear()
+
+
+def fingerprint(endpoint: str, params: dict[str, Any]) -> str:
+    """A stable key identifying a request; `None` parameters and `vary` are ignored."""
+    canonical = {k: v for k, v in params.items() if v is not None and k != "vary"}
+    return endpoint + "?" + json.dumps(canonical, sort_keys=True, separators=(",", ":"), cls=ModelEncoder)
+
+
+Tag = tuple[str, str]
+"""`(idName, id)`, eg. `("gameId", "76rqmld8")`."""
+
+TAG_PARAMS = ("gameId", "categoryId", "levelId", "userId", "seriesId", "forumId", "threadId", "runId")
+"""Request parameters that a cached response is tagged with."""
+
+TAG_FIELDS = {"game": "gameId", "user": "userId", "series": "seriesId", "forum": "forumId", "thread": "threadId"}
+"""Response fields holding a single entity that a cached response is tagged with, by the tag name used."""
+
+LIST_FIELDS = {"gameList": "gameId", "userList": "userId", "seriesList": "seriesId", "forumList": "forumId",
+               "threadList": "threadId"}
+"""Response fields listing entities whose dates are checked against cached responses, by the tag name used."""
+
+DATE_FIELDS = ("touchDate", "lastPostDate", "lastCommentDate")
+"""Fields dating the last change to an entity; the latest present is used."""
+
+PROBES = {"gameId": ("GetGameData", "gameId"), "userId": ("GetUserPopoverData", "userId"), "seriesId": ("GetSeriesSummary", "seriesId")}
+"""Small requests returning the current date of an entity, by tag name: `(endpoint, idParameter)`."""
+
+UNCACHED = frozenset({"GetLatestLeaderboard", "GetHomeSummary", "GetStreamList", "GetSearch"})
+"""Endpoints listing recent activity, which no entity date or audit log event tracks; not cached unless listed explicitly."""
+
+RUN_ENDPOINTS = frozenset({"GetGameLeaderboard", "GetGameLeaderboard2", "GetGameRecordHistory", "GetGameSummary",
+                           "GetGameLevelSummary", "GetLatestLeaderboard"})
+"""Endpoints whose responses change whenever a run of the game is added or changed."""
+
+
+class ResponseCache():
+    """LRU cache of responses by request, invalidated when the entities they depend on change.
+
+    Attach to a client with `SpeedrunClient(response_cache=ResponseCache())`; GET requests are then served from the
+    cache until invalidated. Each response is tagged with the ids of its request parameters (`gameId`, `categoryId`...)
+    and of the game, user, series, forum or thread it describes. Entries are invalidated when:
+    - a response is seen (by `put` or `observe`) containing a `Game`, `User`, `Series`, `Forum` or `Thread` dated later
+      (by `touchDate`, `lastPostDate` or `lastCommentDate`) than cached responses were based on. Entities listed in a
+      response (eg. `GetThreadList`'s threads) are checked too, so a listing refreshes the cached pages of what it lists.
+    - an audit log event is passed to `on_event`, eg. from `auditlog.AuditLogTailer`. Run events only invalidate run
+      listings (leaderboards, summaries etc.) of the run's category; other game events invalidate everything of that game.
+    - an entry is older than `max_age` seconds, if set.
+
+    As a response served from the cache is never checked against SRC, set `revalidate_after` to check the dates of
+    the game, user or series an entry describes once it is that many seconds old, with a small request (see `PROBES`).
+    Each entity is checked at most once per `revalidate_after`, however many entries describe it.
+
+    - @endpoints: If provided, only responses from these endpoints are cached; otherwise all except `UNCACHED`.
+
+    Invalidated & evicted responses are kept aside (up to `maxsize` of them) and returned by `get_stale`, for serving while
+    SRC is unavailable (see `api.CircuitBreaker`).
+
+    As with `ParseCache`, cached models are shared between callers and must be treated as frozen."""
+
+    def __init__(self, maxsize: int = 1024, endpoints: Iterable[str] | None = None, max_age: float | None = None,
+                 revalidate_after: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.endpoints = None if endpoints is None else frozenset(endpoints)
+        self.max_age = max_age
+        self.revalidate_after = revalidate_after
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[SpeedrunModel, frozenset[Tag], str | None, float]] = OrderedDict()
+        self._index: dict[Tag, set[str]] = {}
+        self._touched: dict[Tag, int] = {}
+        self._checked: dict[Tag, float] = {}
+        self._stale: OrderedDict[str, SpeedrunModel] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def accepts(self, endpoint: str) -> bool:
+        if self.endpoints is None: return endpoint not in UNCACHED
+        return endpoint in self.endpoints
+
+    def get(self, key: str) -> SpeedrunModel | None:
+        entry = self._entries.get(key)
+        if entry is not None and self.max_age is not None and time.monotonic() - entry[3] > self.max_age:
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def due(self, key: str) -> list[Tag]:
+        """Tags of an entry whose entity should be revalidated before the entry is served; each is then marked as checked."""
+        entry = self._entries.get(key)
+        if entry is None or self.revalidate_after is None: return []
+        now = time.monotonic()
+        if now - entry[3] < self.revalidate_after: return []
+        tags = [tag for tag in entry[1] if tag[0] in PROBES and now - self._checked.get(tag, entry[3]) >= self.revalidate_after]
+        for tag in tags:
+            self._checked[tag] = now
+        return tags
+
+    def probe(self, tag: Tag, _client: "SpeedrunClient | None" = None) -> "BaseRequest":
+        """A small request returning the current date of a tagged entity; see `PROBES`."""
+        from . import endpoints
+        endpoint, param = PROBES[tag[0]]
+        return getattr(endpoints, endpoint)(_client=_client, **{param: tag[1]})
+
+    def get_stale(self, key: str) -> SpeedrunModel | None:
+        """Get the latest response to a request even if it has since been invalidated or evicted."""
+        entry = self._entries.get(key)
+        if entry is not None: return entry[0]
+        return self._stale.get(key)
+
+    def put(self, key: str, endpoint: str, params: dict[str, Any], response: SpeedrunModel):
+        """Cache `response` to a request, after invalidating entries made stale by it."""
+        self.observe(response)
+        flat = params | (params.get("params") or {})
+        tags = {(name, flat[name]) for name in TAG_PARAMS if isinstance(flat.get(name), str)}
+        for _, tag in self._dated(response):
+            tags.add(tag)
+        if endpoint in RUN_ENDPOINTS and isinstance(flat.get("gameId"), str):
+            tags.add(("runs", flat["gameId"]))
+
+        self._remove(key)
+        self._stale.pop(key, None)
+        self._entries[key] = (response, frozenset(tags), flat.get("categoryId"), time.monotonic())
+        for tag in tags:
+            self._index.setdefault(tag, set()).add(key)
+        if len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def observe(self, response: SpeedrunModel):
+        """Invalidate entries based on older versions of any dated entity in `response`."""
+        for date, tag in self._dated(response):
+            self._observe(date, tag)
+        for field, name in LIST_FIELDS.items():
+            for entity in getattr(response, field, None) or ():
+                date = _date(entity)
+                # Only entities with cached responses are tracked, so crawling listings does not grow `_touched`
+                if date is not None and (name, entity.id) in self._index:
+                    self._observe(date, (name, entity.id))
+
+    def _observe(self, date: int, tag: Tag):
+        known = self._touched.get(tag)
+        if known is not None and date > known:
+            self.invalidate(tag)
+        if known is None or date > known:
+            self._touched[tag] = date
+
+    def on_event(self, event: "AuditEvent | AuditGap"):
+        """Invalidate entries affected by an audit log event."""
+        from .auditlog import AuditGap
+        if isinstance(event, AuditGap):
+            # Unknown changes were missed; drop everything they could have affected
+            if event.kind == "gameId":
+                self.invalidate(("gameId", event.sourceId))
+                self.invalidate_runs(event.sourceId)
+            else:
+                self.clear()
+            return
+        gameId = event.entry.gameId
+        if event.entry.userId is not None:
+            self.invalidate(("userId", event.entry.userId))
+        if event.eventType.startswith("comment-"):
+            return
+        if event.eventType.startswith("run-"):
+            categoryId = event.run.categoryId if event.run is not None else event.context.get("categoryId")
+            self.invalidate_runs(gameId, categoryId if isinstance(categoryId, str) else None)
+            if event.run is not None:
+                self.invalidate(("runId", event.run.id))
+        else:
+            self.invalidate(("gameId", gameId))
+
+    def invalidate(self, tag: Tag) -> int:
+        """Drop every entry with `tag`, returning the number dropped."""
+        keys = list(self._index.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def invalidate_runs(self, gameId: str, categoryId: str | None = None) -> int:
+        """Drop run listings of a game, or only those of one category (and listings spanning all categories)."""
+        keys = [key for key in self._index.get(("runs", gameId), ())
+                if categoryId is None or self._entries[key][2] in (None, categoryId)]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._index.clear()
+        self._checked.clear()
+        self._stale.clear()
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None: return
+        self._stale[key] = entry[0]
+        self._stale.move_to_end(key)
+        if len(self._stale) > self.maxsize:
+            self._stale.popitem(last=False)
+        for tag in entry[1]:
+            keys = self._index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys: del self._index[tag]
+
+    @staticmethod
+    def _dated(response: SpeedrunModel) -> Iterable[tuple[int, Tag]]:
+        for field, name in TAG_FIELDS.items():
+            entity = getattr(response, field, None)
+            date = _date(entity)
+            if isinstance(entity, SpeedrunModel) and date is not None:
+                yield date, (name, entity.id)
+
+
+def _date(entity: Any) -> int | None:
+    """The latest of an entity's `DATE_FIELDS`."""
+    dates = [d for d in (getattr(entity, f, None) for f in DATE_FIELDS) if isinstance(d, int)]
+    return max(dates) if dates else None
+
+
+class PagePlanner():
+    """Remembers how many pages each paginated request had, so `perform_all` need not wait for page 1 to learn the count.
+
+    Attach to a client with `SpeedrunClient(page_planner=PagePlanner())`. `perform_all` then requests every page expected
+    from the last time the same request was made alongside page 1; a request not seen before fetches page 2 alongside page 1
+    if `speculate`. Once page 1 arrives the count is reconciled: pages past the end are discarded and any missing pages fetched."""
+
+    def __init__(self, maxsize: int = 4096, speculate: bool = True) -> None:
+        self.maxsize = maxsize
+        self.speculate = speculate
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        """Pages fetched that turned out not to exist."""
+        self._counts: OrderedDict[str, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def expected(self, key: str) -> int | None:
+        """The page count last seen for a request, by `fingerprint`."""
+        count = self._counts.get(key)
+        if count is None:
+            self.misses += 1
+            return None
+        self._counts.move_to_end(key)
+        self.hits += 1
+        return count
+
+    def guess(self, key: str) -> int:
+        """Pages to request at once for a request."""
+        count = self.expected(key)
+        if count is None: return 2 if self.speculate else 1
+        return max(count, 1)
+
+    def record(self, key: str, pages: int):
+        self._counts[key] = pages
+        self._counts.move_to_end(key)
+        if len(self._counts) > self.maxsize:
+            self._counts.popitem(last=False)
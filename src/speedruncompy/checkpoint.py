@@ -0,0 +1,77 @@
+"""Record the progress of long crawls in SQLite, so a restarted worker resumes where it stopped.
+
+A `Checkpoint` holds the set of completed units of work (eg. the pages of each request) and named JSON cursors:
+```python
+with Checkpoint("crawl.sqlite") as checkpoint:
+    async for run in crawl_game_runs("76rqmld8", checkpoint=checkpoint):
+        ...
+```
+Supported by `crawl.crawl_leaderboards` & `crawl.crawl_game_runs`, `auditlog.AuditLogTailer` and the `srcompy-export` script.
+
+Work is marked complete only after its results have been handed on, so after a crash the unit in progress is repeated:
+results may be delivered more than once, but never skipped.
+"""
+
+import json
+import sqlite3
+from typing import Any
+
+from .api import BaseRequest
+from .cache import fingerprint
+
+
+def request_key(request: BaseRequest, page: int | None = None) -> str:
+    """Key identifying a request (or one page of it) by endpoint & parameters."""
+    key = fingerprint(request.endpoint, request.params)
+    return key if page is None else f"{key}#{page}"
+
+
+class Checkpoint():
+    """Persistent progress of a crawl. Each change is committed immediately.
+
+    Use `":memory:"` as the path for a checkpoint that lasts only as long as the object."""
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS done (key TEXT PRIMARY KEY)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cursors (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def is_done(self, key: str) -> bool:
+        return self._db.execute("SELECT 1 FROM done WHERE key = ?", (key,)).fetchone() is not None
+
+    def mark_done(self, key: str):
+        with self._db:
+            self._db.execute("INSERT OR IGNORE INTO done (key) VALUES (?)", (key,))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get the cursor stored as `key`."""
+        row = self._db.execute("SELECT value FROM cursors WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serialisable cursor as `key`."""
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO cursors (key, value) VALUES (?, ?)",
+                             (key, json.dumps(value, separators=(",", ":"))))
+
+    def delete(self, key: str):
+        with self._db:
+            self._db.execute("DELETE FROM cursors WHERE key = ?", (key,))
+            self._db.execute("DELETE FROM done WHERE key = ?", (key,))
+
+    def clear(self):
+        """Forget all progress, eg. to start a new crawl."""
+        with self._db:
+            self._db.execute("DELETE FROM done")
+            self._db.execute("DELETE FROM cursors")
@@ -0,0 +1,189 @@
+"""Compact column-oriented storage of runs, for analytics over very large numbers of runs.
+
+A `Run` model costs around 2KB in memory (once it is in a dict); a `RunTable` row costs around 130 bytes. Build one directly from
+leaderboard pages and discard the pages as you go:
+```python
+table = RunTable()
+for page in (await GetGameLeaderboard2(gameId="a", categoryId="b")._perform_all_raw()).values():
+    table.add_page(page)
+```
+"""
+
+from array import array
+from math import isnan, nan
+from typing import Any, Iterable, Iterator
+
+from .datatypes import Run, Leaderboard
+from .datatypes._impl import SpeedrunModel
+from .datatypes.enums import Verified
+
+
+def runs_of(response: SpeedrunModel) -> list[Run]:
+    """Locate the run list of a response; `runList`, `runs`, or `leaderboard.runs`."""
+    leaderboard = getattr(response, "leaderboard", None)
+    if isinstance(leaderboard, Leaderboard): return leaderboard.runs
+    runs = getattr(response, "runList", None)
+    if runs is None: runs = getattr(response, "runs", None)
+    if runs is None: raise TypeError(f"{type(response).__name__} has no run list")
+    return runs
+
+
+class StringColumn():
+    """Column of unique strings packed into a single buffer, addressed by offsets."""
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    def append(self, s: str):
+        self.data += s.encode()
+        self.offsets.append(len(self.data))
+
+
+class DictionaryColumn():
+    """Column of repeated strings, stored as `int32` codes into `values`. `None` is stored as -1."""
+    def __init__(self, values: list[str] | None = None) -> None:
+        self.values: list[str] = []
+        self.lookup: dict[str, int] = {}
+        self.codes = array("i")
+        for v in values or []:
+            self.encode(v)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str | None:
+        code = self.codes[i]
+        return None if code == -1 else self.values[code]
+
+    def encode(self, s: str | None) -> int:
+        if s is None: return -1
+        code = self.lookup.get(s)
+        if code is None:
+            code = self.lookup[s] = len(self.values)
+            self.values.append(s)
+        return code
+
+    def append(self, s: str | None):
+        self.codes.append(self.encode(s))
+
+
+class ListColumn():
+    """Column of lists of repeated strings, e.g. `playerIds`. Values are dictionary-encoded, rows addressed by offsets."""
+    def __init__(self) -> None:
+        self.items = DictionaryColumn()
+        self.offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> list[str]:
+        values, codes = self.items.values, self.items.codes
+        return [values[codes[c]] for c in range(self.offsets[i], self.offsets[i + 1])]
+
+    def append(self, strings: list[str]):
+        for s in strings:
+            self.items.append(s)
+        self.offsets.append(len(self.items))
+
+
+class RunTable():
+    """Column-oriented collection of runs.
+
+    - Times are `float64`, with `nan` where absent.
+    - Dates are `int64`, with -1 where absent.
+    - `place` is `int32`, with 0 where absent.
+    - `verified` is `int8`; `emulator` & `obsolete` are `int8` with -1 where absent.
+    - `gameId`, `categoryId`, `levelId`, `platformId` & `regionId` are dictionary-encoded.
+    - `playerIds` & `valueIds` are dictionary-encoded lists.
+
+    Fields not listed here (comments, videos etc.) are not stored."""
+
+    TIME_COLUMNS = ("time", "timeWithLoads", "igt")
+    DATE_COLUMNS = ("date", "dateSubmitted", "dateVerified")
+    ID_COLUMNS = ("gameId", "categoryId", "levelId", "platformId", "regionId")
+    LIST_COLUMNS = ("playerIds", "valueIds")
+
+    def __init__(self) -> None:
+        self.id = StringColumn()
+        self.time = array("d")
+        self.timeWithLoads = array("d")
+        self.igt = array("d")
+        self.date = array("q")
+        self.dateSubmitted = array("q")
+        self.dateVerified = array("q")
+        self.place = array("i")
+        self.verified = array("b")
+        self.emulator = array("b")
+        self.obsolete = array("b")
+        self.gameId = DictionaryColumn()
+        self.categoryId = DictionaryColumn()
+        self.levelId = DictionaryColumn()
+        self.platformId = DictionaryColumn()
+        self.regionId = DictionaryColumn()
+        self.playerIds = ListColumn()
+        self.valueIds = ListColumn()
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[SpeedrunModel]) -> "RunTable":
+        """Build a table from leaderboard pages, eg. the values of `_perform_all_raw()`."""
+        table = cls()
+        for page in pages:
+            table.add_page(page)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def add_page(self, page: SpeedrunModel):
+        """Add the runs of a response; see `runs_of()`."""
+        self.extend(runs_of(page))
+
+    def extend(self, runs: Iterable[Run]):
+        for run in runs:
+            self.append(run)
+
+    def append(self, run: Run):
+        self.id.append(run.id)
+        for name in self.TIME_COLUMNS:
+            value = getattr(run, name)
+            getattr(self, name).append(nan if value is None else value)
+        for name in self.DATE_COLUMNS:
+            value = getattr(run, name)
+            getattr(self, name).append(-1 if value is None else value)
+        self.place.append(run.place or 0)
+        self.verified.append(run.verified)
+        self.emulator.append(run.emulator)
+        self.obsolete.append(-1 if run.obsolete is None else run.obsolete)
+        for name in self.ID_COLUMNS:
+            getattr(self, name).append(getattr(run, name))
+        for name in self.LIST_COLUMNS:
+            getattr(self, name).append(getattr(run, name))
+
+    def row(self, i: int) -> dict[str, Any]:
+        """Decode a single row into a dict of the stored fields, using `None` for absent values."""
+        out: dict[str, Any] = {"id": self.id[i]}
+        for name in self.TIME_COLUMNS:
+            value = getattr(self, name)[i]
+            out[name] = None if isnan(value) else value
+        for name in self.DATE_COLUMNS:
+            value = getattr(self, name)[i]
+            out[name] = None if value == -1 else value
+        out["place"] = self.place[i] or None
+        out["verified"] = Verified(self.verified[i])
+        out["emulator"] = bool(self.emulator[i])
+        out["obsolete"] = None if self.obsolete[i] == -1 else bool(self.obsolete[i])
+        for name in self.ID_COLUMNS + self.LIST_COLUMNS:
+            out[name] = getattr(self, name)[i]
+        return out
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self.row(i) for i in range(len(self)))
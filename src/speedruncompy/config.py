@@ -3,9 +3,25 @@
 strict_mode: Enables pydantic strict mode; errors instead of coercing compatible types. Default False.
 
 check_extras: NOT_IMPLEMENTED: Logs at runtime whether additional fields not known to speedruncompy are present. Intended to alert downstream users to update speedruncompy.
+
+max_response_size: Hard cap in bytes on a single response body. Larger responses raise `ResponseTooLarge`. Default 256MiB.
+
+read_chunk_size: Size in bytes of chunks read from streamed responses. Default 64KiB.
+
+intern_ids: Interns id fields (`gameId`, `playerIds` etc.) on validation, so repeated ids share one `str`. Default False.
+
+intern_table_size: Maximum number of ids held by the intern table before it is reset. Default 1,000,000.
 """
 
 strict_mode: bool = False
 
 check_extras: bool = False
 """TODO: not implemented"""
+
+max_response_size: int = 256 * 1024 * 1024
+
+read_chunk_size: int = 64 * 1024
+
+intern_ids: bool = False
+
+intern_table_size: int = 1_000_000
@@ -0,0 +1,133 @@
+"""Crawl every run of a game.
+
+APIv2 has no endpoint returning all of a game's runs, so the crawler reads `GetGameData`, plans a `GetGameLeaderboard2`
+request for every leaderboard (category, level & in-scope subcategory combination), and fetches them all with bounded concurrency.
+```python
+async for run in crawl_game_runs("76rqmld8"):
+    ...
+```
+Pass a `checkpoint.Checkpoint` to resume an interrupted crawl without refetching pages already yielded.
+"""
+
+import asyncio
+import itertools
+from collections import deque
+from typing import AsyncIterator, Iterable
+
+from .api import SpeedrunClient, _default, _bulk_task
+from .cache import fingerprint
+from .checkpoint import Checkpoint, request_key
+from .datatypes import Run, VarValues, Variable, Value, Category, Level
+from .datatypes.enums import ObsoleteFilter, VideoFilter, VarCategoryScope, VarLevelScope
+from .datatypes.responses import r_GetGameData
+from .endpoints import GetGameData, GetGameLeaderboard2
+
+
+def _variable_applies(variable: Variable, category: Category, level: Level | None) -> bool:
+    """If a variable is shown on a category's leaderboard (or one of its levels' leaderboards)."""
+    if variable.categoryScope == VarCategoryScope.SINGLE and variable.categoryId != category.id:
+        return False
+    match variable.levelScope:
+        case VarLevelScope.FULL_GAME: return level is None
+        case VarLevelScope.LEVELS: return level is not None
+        case VarLevelScope.SINGLE_LEVEL: return level is not None and variable.levelId == level.id
+    return True
+
+
+def plan_matrix(game_data: r_GetGameData) -> list[tuple[Category, Level | None, tuple[Value, ...]]]:
+    """Enumerate every distinct leaderboard of a game as `(category, level, subcategoryValues)`.
+
+    Only subcategory variables in scope for each category & level are combined; archived categories, levels, variables
+    & values are skipped, as are variables with no values left. Each leaderboard appears exactly once."""
+    values_by_variable: dict[str, list[Value]] = {}
+    for value in sorted(game_data.values, key=lambda v: v.pos):
+        if not value.archived:
+            values_by_variable.setdefault(value.variableId, []).append(value)
+    subcategories = [v for v in sorted(game_data.variables, key=lambda v: v.pos)
+                     if v.isSubcategory and not v.archived and values_by_variable.get(v.id)]
+    levels = [level for level in sorted(game_data.levels, key=lambda lv: lv.pos) if not level.archived]
+
+    matrix: list[tuple[Category, Level | None, tuple[Value, ...]]] = []
+    seen: set[tuple[str, str | None, frozenset[str]]] = set()
+    for category in sorted(game_data.categories, key=lambda c: c.pos):
+        if category.archived: continue
+        for level in (levels if category.isPerLevel else [None]):
+            variables = [v for v in subcategories if _variable_applies(v, category, level)]
+            for combination in itertools.product(*[values_by_variable[v.id] for v in variables]):
+                key = (category.id, None if level is None else level.id, frozenset(value.id for value in combination))
+                if key in seen: continue
+                seen.add(key)
+                matrix.append((category, level, combination))
+    return matrix
+
+
+def plan_leaderboards(game_data: r_GetGameData, _client: SpeedrunClient | None = None, **filters) -> list[GetGameLeaderboard2]:
+    """Plan the smallest set of `GetGameLeaderboard2` requests covering every leaderboard of a game; see `plan_matrix`.
+
+    `filters` are passed to every request, eg. `obsolete` or `video`."""
+    return [GetGameLeaderboard2(gameId=game_data.game.id, categoryId=category.id, levelId=None if level is None else level.id,
+                                values=[VarValues(variableId=value.variableId, valueIds=[value.id]) for value in combination] or None,
+                                _client=_client, **filters)
+            for category, level, combination in plan_matrix(game_data)]
+
+
+async def crawl_leaderboards(requests: Iterable[GetGameLeaderboard2], concurrency: int = 4,
+                             retries=5, delay=1, checkpoint: Checkpoint | None = None) -> AsyncIterator[Run]:
+    """Fetch every page of every request, yielding each run once.
+
+    At most `concurrency` pages are in flight at a time. Pages of large boards are spread over all available slots,
+    and a board's remaining pages are scheduled ahead of boards not yet started. Requests are sent at `Priority.BULK`
+    unless another priority is set.
+
+    With a `checkpoint`, each page is recorded once all its runs have been yielded, and recorded pages are skipped.
+    Runs seen before a restart are not remembered, so may be yielded again if they appear on another board."""
+    queue: deque[tuple[GetGameLeaderboard2, int]] = deque()
+    for request in requests:
+        numpages = None if checkpoint is None else checkpoint.get(request_key(request))
+        if checkpoint is None or numpages is None:
+            queue.append((request, 1))
+        else:
+            queue.extend((request, p) for p in range(2, numpages + 1) if not checkpoint.is_done(request_key(request, p)))
+    running: dict[asyncio.Future, tuple[GetGameLeaderboard2, int]] = {}
+    seen: set[str] = set()
+    try:
+        while queue or running:
+            while queue and len(running) < max(concurrency, 1):
+                request, page = queue.popleft()
+                running[_bulk_task(request.perform(retries, delay, page=page))] = (request, page)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                request, page = running.pop(task)
+                result = task.result()
+                if page == 1:
+                    queue.extendleft((request, p) for p in range(result.pagination.pages, 1, -1))
+                for run in result.runList:
+                    if run.id not in seen:
+                        seen.add(run.id)
+                        yield run
+                if checkpoint is not None:
+                    if page == 1:
+                        checkpoint.set(request_key(request), result.pagination.pages)
+                    else:
+                        checkpoint.mark_done(request_key(request, page))
+    finally:
+        for task in running:
+            task.cancel()
+
+
+async def crawl_game_runs(gameId: str, _client: SpeedrunClient | None = None, concurrency: int = 4,
+                          obsolete: ObsoleteFilter = ObsoleteFilter.SHOWN, video: VideoFilter = VideoFilter.OPTIONAL,
+                          checkpoint: Checkpoint | None = None, **filters) -> AsyncIterator[Run]:
+    """Yield every run of a game across all its leaderboards, each run once.
+
+    By default obsolete runs and runs without video are included; other `filters` (eg. `verified`) are passed to every request.
+    See `crawl_leaderboards` for `checkpoint`; a game whose crawl completed is skipped entirely."""
+    client = _default if _client is None else _client
+    key = fingerprint("crawl_game_runs", {"gameId": gameId, "obsolete": obsolete, "video": video} | filters)
+    if checkpoint is not None and checkpoint.is_done(key): return
+    game_data = await GetGameData(gameId=gameId, _client=client).perform()
+    requests = plan_leaderboards(game_data, _client=client, obsolete=obsolete, video=video, **filters)
+    async for run in crawl_leaderboards(requests, concurrency, checkpoint=checkpoint):
+        yield run
+    if checkpoint is not None:
+        checkpoint.mark_done(key)
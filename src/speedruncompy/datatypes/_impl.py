@@ -7,6 +7,36 @@ from bidict import frozenbidict, BidirectionalMapping
 
 from .. import config
 
+INTERN_FIELDS = frozenset({
+    "gameId", "categoryId", "levelId", "platformId", "regionId", "variableId", "valueId", "seriesId", "forumId",
+    "userId", "submittedById", "verifiedById", "actorId", "areaId", "color1Id", "color2Id",
+    "playerIds", "valueIds", "platformIds", "regionIds",
+})
+"""Fields holding ids that are repeated across many objects. Entities' own `id`s are mostly unique, so are not interned."""
+
+class _InternTable():
+    """Bounded intern table. Once `config.intern_table_size` is reached it is reset, so it tracks the ids currently in use."""
+    def __init__(self) -> None:
+        self._table: dict[str, str] = {}
+    
+    def __len__(self) -> int:
+        return len(self._table)
+    
+    def __call__(self, s: str) -> str:
+        table = self._table
+        try:
+            return table[s]
+        except KeyError:
+            if len(table) >= config.intern_table_size:
+                table.clear()
+            table[s] = s
+            return s
+    
+    def clear(self):
+        self._table.clear()
+
+_intern = _InternTable()
+
 class SpeedrunModel(BaseModel, ser_json_timedelta='float', extra='allow'):
     __condenser_map__: ClassVar[BidirectionalMapping[str, str]] = frozenbidict()
     """Internal mapping of list fields into dict fields, used for constructing dicts at runtime.
@@ -16,6 +46,26 @@ class SpeedrunModel(BaseModel, ser_json_timedelta='float', extra='allow'):
     __condenser_overrides__: ClassVar[dict[str, str]] = {}
     """Internal mapping of list fields' id names. Used for some types that have a PKEY not named 'id'."""
     
+    __intern_fields__: ClassVar[tuple[str, ...]] = ()
+    """Fields of this model in `INTERN_FIELDS`, interned on validation when `config.intern_ids` is set."""
+    
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__intern_fields__ = tuple(f for f in cls.model_fields if f in INTERN_FIELDS)
+    
+    @model_validator(mode='after')
+    def intern_ids(self) -> Self:
+        if not config.intern_ids or not self.__intern_fields__: return self
+        fields = self.__dict__
+        for name in self.__intern_fields__:
+            value = fields.get(name)
+            if isinstance(value, str):
+                fields[name] = _intern(value)
+            elif isinstance(value, list):
+                value[:] = [_intern(v) if isinstance(v, str) else v for v in value]
+        return self
+    
     @model_validator(mode='after')
     def create_condensed_dicts(self) -> Self:
         for source_field_name, target_field_name in self.__condenser_map__.items():
@@ -174,6 +174,14 @@ class r_GetGameList(SpeedrunModel):
 class r_GetGameRecordHistory(SpeedrunModel):
     playerList: list[Player]
     runList: list[Run]
+    
+    _playerDict: dict[str, Player]
+    _runDict: dict[str, Run]
+    
+    __condenser_map__ = frozenbidict({
+        "playerList": "_playerDict",
+        "runList": "_runDict",
+    })
 
 class r_GetGameSummary(SpeedrunModel):
     game: Game
@@ -326,6 +334,28 @@ class r_GetUserLeaderboard(SpeedrunModel):
     """Unused null key"""
     challengeList: list[Challenge]
     challengeRunList: list[ChallengeRun]
+    
+    _categoryDict: dict[str, Category]
+    _gameDict: dict[str, Game]
+    _levelDict: dict[str, Level]
+    _platformDict: dict[str, Platform]
+    _regionDict: dict[str, Region]
+    _runDict: dict[str, Run]
+    _playerDict: dict[str, Player]
+    _valueDict: dict[str, Value]
+    _variableDict: dict[str, Variable]
+    
+    __condenser_map__ = frozenbidict({
+        "categories": "_categoryDict",
+        "games": "_gameDict",
+        "levels": "_levelDict",
+        "platforms": "_platformDict",
+        "regions": "_regionDict",
+        "runs": "_runDict",
+        "players": "_playerDict",
+        "values": "_valueDict",
+        "variables": "_variableDict",
+    })
 
 class r_GetUserSummary(SpeedrunModel):
     user: User
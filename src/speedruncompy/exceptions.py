@@ -18,11 +18,20 @@ class AuthException(Exception):
 class AIOException(Exception):
     """Synchronous interface called from asynchronous context - use `await perform_async` instead."""
 
+class ResponseTooLarge(Exception):
+    """A response body exceeded `config.max_response_size`."""
+
+class CircuitOpen(Exception):
+    """The client's circuit breaker is refusing requests while SRC is failing."""
+
+_MAX_BODY_PREVIEW = 4096
+
 class APIException(Exception):
     def __init__(self, caller: 'BaseRequest', *args) -> None:
         self.caller = caller
-        status = self.caller.response[1]
-        super().__init__(status, self.caller.response[0].decode("utf-8"), self.caller, *args)
+        status, content = self.caller.response[1], self.caller.response[0]
+        # Error bodies are usually small, but only decode a preview in case SRC sends back a full page.
+        super().__init__(status, bytes(content[:_MAX_BODY_PREVIEW]).decode("utf-8", errors="replace"), self.caller, *args)
 
 class ClientException(APIException):
     """There was an issue with your request that the client must handle."""
@@ -0,0 +1,112 @@
+"""Export run lists to NumPy structured arrays & Arrow tables in a single pass.
+
+Player names, platform & region names and variable values are joined in from the response's condenser dicts, where the response has them.
+
+Requires the `export` extra: `pip install speedruncompy[export]`.
+```python
+leaderboard = GetGameLeaderboard2(gameId="a", categoryId="b").perform_all_sync()
+table = runs_to_arrow(leaderboard)
+df = table.to_pandas()
+```
+"""
+
+import importlib
+from typing import Any, Iterator
+
+from .columnar import runs_of
+from .datatypes._impl import SpeedrunModel
+
+COLUMNS = ("id", "gameId", "categoryId", "levelId", "time", "timeWithLoads", "igt", "date", "dateSubmitted", "dateVerified",
+           "place", "verified", "emulator", "obsolete", "platformId", "platformName", "regionId", "regionName",
+           "playerIds", "playerNames", "valueIds", "values")
+
+
+def _require(module: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f"{module} is required for this export; install with `pip install speedruncompy[export]`") from None
+
+
+def _lookup(response: SpeedrunModel, name: str) -> dict:
+    return getattr(response, f"_{name}Dict", None) or {}
+
+
+def _rows(response: SpeedrunModel) -> Iterator[tuple]:
+    """Yield one tuple per run, ordered as `COLUMNS`. Absent values are `None`."""
+    source = getattr(response, "leaderboard", response)
+    players, platforms, regions = _lookup(source, "player"), _lookup(source, "platform"), _lookup(source, "region")
+    values, variables = _lookup(source, "value"), _lookup(source, "variable")
+
+    for run in runs_of(response):
+        platform = platforms.get(run.platformId)
+        region = regions.get(run.regionId)
+        run_values = None
+        if values:
+            run_values = {}
+            for value_id in run.valueIds:
+                value = values.get(value_id)
+                if value is None: continue
+                variable = variables.get(value.variableId)
+                run_values[value.variableId if variable is None else variable.name] = value.name
+        yield (run.id, run.gameId, run.categoryId, run.levelId, run.time, run.timeWithLoads, run.igt,
+               run.date, run.dateSubmitted, run.dateVerified, run.place, int(run.verified), run.emulator, run.obsolete,
+               run.platformId, None if platform is None else platform.name,
+               run.regionId, None if region is None else region.name,
+               run.playerIds, [getattr(players.get(p), "name", None) for p in run.playerIds],
+               run.valueIds, run_values)
+
+
+def numpy_dtype() -> Any:
+    np = _require("numpy")
+    return np.dtype([
+        ("id", "O"), ("gameId", "O"), ("categoryId", "O"), ("levelId", "O"),
+        ("time", "f8"), ("timeWithLoads", "f8"), ("igt", "f8"),
+        ("date", "i8"), ("dateSubmitted", "i8"), ("dateVerified", "i8"),
+        ("place", "i4"), ("verified", "i1"), ("emulator", "?"), ("obsolete", "?"),
+        ("platformId", "O"), ("platformName", "O"), ("regionId", "O"), ("regionName", "O"),
+        ("playerIds", "O"), ("playerNames", "O"), ("valueIds", "O"), ("values", "O"),
+    ])
+
+
+def runs_to_numpy(response: SpeedrunModel) -> Any:
+    """Convert a response's runs into a NumPy structured array.
+
+    Absent times are `nan`, absent dates are -1 and absent places are 0, matching `columnar.RunTable`. Absent `obsolete` is False."""
+    np = _require("numpy")
+    nan = float("nan")
+
+    def fill(row: tuple) -> tuple:
+        (id, game, category, level, time, time_loads, igt, date, submitted, verified_date, place, verified, emulator, obsolete,
+         *rest) = row
+        return (id, game, category, level,
+                nan if time is None else time, nan if time_loads is None else time_loads, nan if igt is None else igt,
+                date, -1 if submitted is None else submitted, -1 if verified_date is None else verified_date,
+                place or 0, verified, emulator, bool(obsolete), *rest)
+
+    runs = runs_of(response)
+    return np.fromiter((fill(row) for row in _rows(response)), dtype=numpy_dtype(), count=len(runs))
+
+
+def arrow_schema() -> Any:
+    pa = _require("pyarrow")
+    return pa.schema([
+        ("id", pa.string()), ("gameId", pa.string()), ("categoryId", pa.string()), ("levelId", pa.string()),
+        ("time", pa.float64()), ("timeWithLoads", pa.float64()), ("igt", pa.float64()),
+        ("date", pa.int64()), ("dateSubmitted", pa.int64()), ("dateVerified", pa.int64()),
+        ("place", pa.int32()), ("verified", pa.int8()), ("emulator", pa.bool_()), ("obsolete", pa.bool_()),
+        ("platformId", pa.string()), ("platformName", pa.string()), ("regionId", pa.string()), ("regionName", pa.string()),
+        ("playerIds", pa.list_(pa.string())), ("playerNames", pa.list_(pa.string())),
+        ("valueIds", pa.list_(pa.string())), ("values", pa.map_(pa.string(), pa.string())),
+    ])
+
+
+def runs_to_arrow(response: SpeedrunModel) -> Any:
+    """Convert a response's runs into a `pyarrow.Table`. Absent values are null."""
+    pa = _require("pyarrow")
+    columns: list[list] = [[] for _ in COLUMNS]
+    appends = [c.append for c in columns]
+    for row in _rows(response):
+        for append, value in zip(appends, row):
+            append(value)
+    return pa.table(dict(zip(COLUMNS, columns)), schema=arrow_schema())
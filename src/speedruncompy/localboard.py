@@ -0,0 +1,138 @@
+"""Compute filtered leaderboard views locally from one broad fetch of a leaderboard.
+
+`GetGameLeaderboard2` ranks runs differently for every combination of filters, so showing many filtered views of one
+leaderboard normally means crawling every view. A `LocalLeaderboard` fetches every run once and recomputes each view:
+```python
+board = await LocalLeaderboard.fetch(gameId="a", categoryId="b")
+pc_only = board.view(platformIds=["c"])
+all_rta = board.view(timer=TimerName.timeWithLoads, obsolete=ObsoleteFilter.SHOWN)
+```
+Places are recomputed for each view: ties share a place, and the next place skips accordingly (1, 2, 2, 4).
+Tied runs are ordered by run date, then by submission date.
+"""
+
+import calendar
+import time as _time
+from typing import Iterable
+
+from .api import SpeedrunClient
+from .datatypes import Run, VarValues
+from .datatypes.enums import EmulatorFilter, ObsoleteFilter, TimeDirection, TimerName, VerifiedFilter, VideoFilter
+from .endpoints import GetGameLeaderboard2
+
+
+def _timestamp(date: str, end_of_day: bool = False) -> int:
+    """Parse a `YYYY-MM-DD` date, as given to `dateFrom` & `dateTo`, into a UTC timestamp."""
+    stamp = calendar.timegm(_time.strptime(date, "%Y-%m-%d"))
+    return stamp + 86399 if end_of_day else stamp
+
+
+def _timer_value(run: Run, timer: TimerName) -> float | None:
+    """A run's time for `timer`. Runs without LRT keep their RTA in `time`, so that stands in for `timeWithLoads`."""
+    if timer == TimerName.timeWithLoads and run.timeWithLoads is None:
+        return run.time
+    return getattr(run, timer.name)
+
+
+class LocalLeaderboard():
+    """A set of runs from a single leaderboard, from which filtered & ranked views can be computed.
+
+    `runs` should include every run that any view may show; see `fetch()`."""
+    def __init__(self, runs: Iterable[Run], timeDirection: TimeDirection = TimeDirection.ASCENDING) -> None:
+        self.runs = list(runs)
+        self.timeDirection = timeDirection
+        self._ordered: dict[tuple[TimerName, TimeDirection], list[Run]] = {}
+        self._index = {run.id: i for i, run in enumerate(self.runs)}
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def __contains__(self, runId: str) -> bool:
+        return runId in self._index
+
+    def add(self, run: Run):
+        """Add a run, replacing any stored run with the same id."""
+        i = self._index.get(run.id)
+        if i is None:
+            self._index[run.id] = len(self.runs)
+            self.runs.append(run)
+        else:
+            self.runs[i] = run
+        self._ordered.clear()
+
+    def replace(self, runs: Iterable[Run]):
+        """Replace every stored run, eg. with a fresh fetch, keeping this object."""
+        self.runs = list(runs)
+        self._index = {run.id: i for i, run in enumerate(self.runs)}
+        self._ordered.clear()
+
+    @classmethod
+    async def fetch(cls, gameId: str, categoryId: str, levelId: str | None = None, values: list[VarValues] | None = None,
+                    timeDirection: TimeDirection = TimeDirection.ASCENDING, verified: VerifiedFilter = VerifiedFilter.VERIFIED,
+                    _client: SpeedrunClient | None = None) -> "LocalLeaderboard":
+        """Fetch every run of a leaderboard, including obsolete, emulated & unvideoed runs on all platforms & regions.
+
+        `timeDirection` should be the category's `timeDirection`."""
+        request = GetGameLeaderboard2(gameId=gameId, categoryId=categoryId, levelId=levelId, values=values, verified=verified,
+                                      obsolete=ObsoleteFilter.SHOWN, emulator=EmulatorFilter.SHOWN, video=VideoFilter.OPTIONAL,
+                                      _client=_client)
+        leaderboard = await request.perform_all()
+        return cls(leaderboard.runList, timeDirection)
+
+    def _order(self, timer: TimerName, direction: TimeDirection) -> list[Run]:
+        """Runs with a time for `timer`, best first. Cached, as every view of the same timer shares this order."""
+        key = (timer, direction)
+        ordered = self._ordered.get(key)
+        if ordered is None:
+            timed = [run for run in self.runs if _timer_value(run, timer) is not None]
+            sign = -1 if direction == TimeDirection.DESCENDING else 1
+            timed.sort(key=lambda run: (sign * _timer_value(run, timer), run.date, run.dateSubmitted or 0))  # type: ignore
+            ordered = self._ordered[key] = timed
+        return ordered
+
+    def view(self, dateFrom: str | None = None, dateTo: str | None = None, emulator: EmulatorFilter = EmulatorFilter.SHOWN,
+             obsolete: ObsoleteFilter = ObsoleteFilter.HIDDEN, platformIds: list[str] | None = None,
+             regionIds: list[str] | None = None, timer: TimerName = TimerName.time,
+             verified: VerifiedFilter = VerifiedFilter.VERIFIED, values: list[VarValues] | None = None,
+             video: VideoFilter = VideoFilter.OPTIONAL, timeDirection: TimeDirection | None = None) -> list[Run]:
+        """Compute the runs of a leaderboard view as `GetGameLeaderboard2` would return them, with the same parameters.
+
+        Runs without a time for `timer` are excluded; for `timeWithLoads`, runs without LRT are ranked by `time` (their RTA). When `obsolete` is hidden, only each player set's best run is kept;
+        otherwise runs beaten by a better run of the same players are included with `place = None` and `obsolete = True`.
+        Returned runs are copies; the stored runs are not modified."""
+        direction = self.timeDirection if timeDirection is None else timeDirection
+        date_from = None if dateFrom is None else _timestamp(dateFrom)
+        date_to = None if dateTo is None else _timestamp(dateTo, end_of_day=True)
+        platforms = None if platformIds is None else set(platformIds)
+        regions = None if regionIds is None else set(regionIds)
+        value_sets = [set(v.valueIds) for v in values or []]
+
+        out: list[Run] = []
+        best: set[frozenset[str]] = set()
+        place, last_time, ranked = 0, None, 0
+        for run in self._order(timer, direction):
+            if run.verified != verified: continue
+            if date_from is not None and run.date < date_from: continue
+            if date_to is not None and run.date > date_to: continue
+            if emulator == EmulatorFilter.HIDDEN and run.emulator: continue
+            if emulator == EmulatorFilter.EXCLUSIVE and not run.emulator: continue
+            if video == VideoFilter.REQUIRED and not run.video: continue
+            if video == VideoFilter.MISSING and run.video: continue
+            if platforms is not None and run.platformId not in platforms: continue
+            if regions is not None and run.regionId not in regions: continue
+            if value_sets and not all(s.intersection(run.valueIds) for s in value_sets): continue
+
+            players = frozenset(run.playerIds)
+            is_obsolete = players in best
+            if is_obsolete:
+                if obsolete == ObsoleteFilter.HIDDEN: continue
+                out.append(run.model_copy(update={"place": None, "obsolete": True}))
+                continue
+            best.add(players)
+            ranked += 1
+            run_time = _timer_value(run, timer)
+            if run_time != last_time:
+                place, last_time = ranked, run_time
+            if obsolete != ObsoleteFilter.EXCLUSIVE:
+                out.append(run.model_copy(update={"place": place, "obsolete": False}))
+        return out
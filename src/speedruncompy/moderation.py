@@ -0,0 +1,201 @@
+"""Watch the moderation queues of every game the logged in account moderates.
+
+Each poll reads `GetModerationGames`, then fetches the queue of every game with pending runs in parallel, using a page size
+large enough to fetch most queues in a single request. Only runs that are new, or have changed since the last poll, are emitted:
+```python
+client = SpeedrunClient(PHPSESSID="...", rate_limiter=RateLimiter(5))
+watcher = ModerationWatcher(_client=client)
+async for run in watcher.watch(interval=60):
+    players = watcher.responses[run.gameId]._playerDict
+```
+Requests are bounded by `concurrency`; set a `RateLimiter` on the client to keep within a request budget.
+
+`BulkExecutor` performs many moderation actions at once, eg. to clear a backlog:
+```python
+results = await BulkExecutor(_client=client).run(PutRunVerification(r.id, Verified.VERIFIED, _client=client) for r in runs)
+failed = [r for r in results if not r.ok]
+```
+"""
+
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from .api import TRANSIENT, BaseRequest, SpeedrunClient, _default
+from .auth import CSRFToken
+from .datatypes import Run, GameModerationStats
+from .datatypes.enums import Verified
+from .datatypes.responses import r_GetModerationRuns
+from .endpoints import GetModerationGames, GetModerationRuns, PutRunAssignee, PutRunVerification, PutRunVideoState
+from .exceptions import AuthException, Forbidden, Unauthorized
+
+MAX_LIMIT = 200
+"""Largest `limit` accepted by `GetModerationRuns`."""
+
+
+def _digest(run: Run) -> bytes:
+    return hashlib.blake2b(run.__pydantic_serializer__.to_json(run), digest_size=16).digest()
+
+
+class ModerationWatcher():
+    """Polls the moderation queues of the logged in account's games.
+
+    - @gameIds: If provided, only these games are watched.
+    - @skip_unchanged: Skip games whose queue count & dates are unchanged since the last poll. Saves most requests,
+      but edits to runs already in a skipped queue are not noticed until the queue next changes."""
+    def __init__(self, _client: SpeedrunClient | None = None, concurrency: int = 8, gameIds: Iterable[str] | None = None,
+                 skip_unchanged: bool = False) -> None:
+        self._client = _client
+        self.concurrency = concurrency
+        self.gameIds = None if gameIds is None else frozenset(gameIds)
+        self.skip_unchanged = skip_unchanged
+        self.responses: dict[str, r_GetModerationRuns] = {}
+        """The latest queue of each game, for resolving the ids of emitted runs."""
+        self._digests: dict[str, bytes] = {}
+        self._stats: dict[str, tuple[int, int | None, int | None]] = {}
+
+    @staticmethod
+    def page_size(count: int) -> int:
+        """Page size fetching a queue of `count` runs in as few requests as possible."""
+        return min(max(count, 1), MAX_LIMIT)
+
+    async def _queue(self, stats: GameModerationStats, semaphore: asyncio.Semaphore) -> r_GetModerationRuns:
+        async with semaphore:
+            request = GetModerationRuns(stats.gameId, limit=self.page_size(stats.count), verified=Verified.PENDING,
+                                        _client=self._client)
+            return await request.perform_all()
+
+    async def poll(self) -> list[Run]:
+        """Poll every queue once, returning runs that are new or changed."""
+        moderation = await GetModerationGames(_client=self._client).perform()
+        if moderation.gameModerationStats is None:
+            raise AuthException("Not logged in, cannot read moderation queues")
+
+        present = {stats.gameId for stats in moderation.gameModerationStats}
+        for gameId in self.responses.keys() - present:
+            del self.responses[gameId]
+
+        watched: list[GameModerationStats] = []
+        for stats in moderation.gameModerationStats:
+            if self.gameIds is not None and stats.gameId not in self.gameIds: continue
+            if stats.count == 0:
+                self.responses.pop(stats.gameId, None)
+                continue
+            key = (stats.count, stats.minDate, stats.maxDate)
+            if self.skip_unchanged and self._stats.get(stats.gameId) == key and stats.gameId in self.responses: continue
+            self._stats[stats.gameId] = key
+            watched.append(stats)
+
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+        queues = await asyncio.gather(*(self._queue(stats, semaphore) for stats in watched))
+
+        emitted: list[Run] = []
+        for stats, queue in zip(watched, queues):
+            self.responses[stats.gameId] = queue
+            for run in queue.runs:
+                digest = _digest(run)
+                if self._digests.get(run.id) != digest:
+                    self._digests[run.id] = digest
+                    emitted.append(run)
+
+        # Forget runs that have left every queue, so they are emitted again should they return
+        pending = {run.id for queue in self.responses.values() for run in queue.runs}
+        for runId in self._digests.keys() - pending:
+            del self._digests[runId]
+        return emitted
+
+    async def watch(self, interval: float = 60) -> AsyncIterator[Run]:
+        """Poll every `interval` seconds forever, yielding new & changed runs."""
+        while True:
+            for run in await self.poll():
+                yield run
+            await asyncio.sleep(interval)
+
+
+RETRYABLE = TRANSIENT
+"""Failures after which an idempotent action is retried."""
+
+IDEMPOTENT: tuple[type[BaseRequest], ...] = (PutRunVerification, PutRunVideoState, PutRunAssignee)
+"""Actions that set state, so may safely be sent again if it is unknown whether SRC applied them."""
+
+
+class ActionResult():
+    """The outcome of one action of a `BulkExecutor.run`."""
+    def __init__(self, request: BaseRequest, response: Any = None, error: BaseException | None = None, attempts: int = 0) -> None:
+        self.request = request
+        self.response = response
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = "ok" if self.ok else f"error={self.error!r}"
+        return f"ActionResult({type(self.request).__name__}, {outcome}, attempts={self.attempts})"
+
+
+class BulkExecutor():
+    """Performs many actions concurrently, each retried independently.
+
+    - @concurrency: Maximum actions in flight. Set a `RateLimiter` on the client to also bound the request rate.
+    - @retries: Further attempts after a retryable failure (see `RETRYABLE`), waiting `delay * 2**attempt` seconds between.
+    - @idempotent: Action types, or a predicate on actions, that may be retried; defaults to `IDEMPOTENT`. A timeout or
+      connection failure may happen after SRC applied an action, so other actions (eg. `PutConversationMessage`) are
+      never retried, and their failures returned.
+    - @csrf: Whether to send the session's csrfToken with every action. By default it is only filled in for actions
+      with a `csrfToken` parameter (eg. `PutRunSettings(None, ...)`).
+
+    The csrfToken is fetched once and cached by `self.csrf`; if an action carrying it is rejected with 401 or 403, a new
+    token is fetched and the action retried once."""
+    def __init__(self, _client: SpeedrunClient | None = None, concurrency: int = 4, retries: int = 3, delay: float = 1,
+                 csrf: bool | None = None,
+                 idempotent: Iterable[type[BaseRequest]] | Callable[[BaseRequest], bool] = IDEMPOTENT) -> None:
+        self._client = _default if _client is None else _client
+        self.concurrency = concurrency
+        self.retries = retries
+        self.delay = delay
+        if callable(idempotent) and not isinstance(idempotent, type):
+            self.idempotent: Callable[[BaseRequest], bool] = idempotent
+        else:
+            types = tuple(idempotent)  # type: ignore
+            self.idempotent = lambda request: isinstance(request, types)
+        self.send_csrf = csrf
+        self.csrf = CSRFToken(_client=self._client)
+
+    def _needs_csrf(self, request: BaseRequest) -> bool:
+        if self.send_csrf is None: return "csrfToken" in request.params
+        return self.send_csrf
+
+    async def _execute(self, request: BaseRequest, semaphore: asyncio.Semaphore) -> ActionResult:
+        result = ActionResult(request)
+        refreshed = False
+        async with semaphore:
+            while True:
+                result.attempts += 1
+                token = None
+                try:
+                    if self._needs_csrf(request):
+                        token = await self.csrf.get()
+                        request.params["csrfToken"] = token
+                    result.response = await request.perform(retries=0)
+                    result.error = None
+                    return result
+                except (Unauthorized, Forbidden) as e:
+                    result.error = e
+                    if token is None or refreshed: return result
+                    self.csrf.invalidate(token)
+                    refreshed = True
+                except RETRYABLE as e:
+                    result.error = e
+                    if result.attempts > self.retries or not self.idempotent(request): return result
+                    await asyncio.sleep(self.delay * 2 ** (result.attempts - 1))
+                except Exception as e:
+                    result.error = e
+                    return result
+
+    async def run(self, actions: Iterable[BaseRequest]) -> list[ActionResult]:
+        """Perform every action, returning a result for each in the same order. Failures are returned, not raised."""
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+        return list(await asyncio.gather(*(self._execute(request, semaphore) for request in actions)))
@@ -0,0 +1,227 @@
+"""
+Streams every page of a paginated endpoint to JSONL or Parquet, with constant memory.
+
+Each output row is one item of the endpoint's main list (eg. `runList` for `GetGameLeaderboard2`).
+
+Example:
+    srcompy-export GetGameLeaderboard2 -p gameId=76rqmld8 -p categoryId=02q8o4p2 -o runs.jsonl --rate 5
+
+Parameter values are kept as strings, so ids like `gameId=12345678` are sent as given. Values starting with `[`, `{` or `"`
+are parsed as JSON (`-p "platformIds=[\\"a\\"]"`); use `key:=value` to parse any other value as JSON, eg. `-p limit:=100`.
+
+JSONL exports may be resumed with `--resume`; progress is recorded alongside the output in `<output>.progress`, or with
+`--checkpoint PATH` in a SQLite checkpoint, which may be shared by many exports (eg. one per game).
+Parquet output requires `pyarrow`; fields not known to speedruncompy are omitted, and nested objects are stored as JSON strings.
+"""
+
+import argparse
+import asyncio
+import enum
+import json
+import os
+import types
+import typing
+from typing import Any
+
+from speedruncompy import endpoints
+from speedruncompy.api import BasePaginatedRequest, RateLimiter, SpeedrunClient
+from speedruncompy.checkpoint import Checkpoint, request_key
+from speedruncompy.datatypes._impl import SpeedrunModel
+
+ITEM_OVERRIDES = {
+    "GetUserComments": "commentList",
+    "GetModerationRuns": "runs",
+}
+"""Endpoints whose main list is not the first entry of their `__condenser_map__`."""
+
+
+def paginated_endpoints() -> dict[str, type[BasePaginatedRequest]]:
+    """All paginated endpoints that can be exported, by name."""
+    out = {}
+    for name, cls in vars(endpoints).items():
+        if isinstance(cls, type) and issubclass(cls, BasePaginatedRequest) and hasattr(cls, "endpoint") \
+                and cls.return_type.__condenser_map__:
+            out[name] = cls
+    return out
+
+
+def item_field(request_t: type[BasePaginatedRequest]) -> str:
+    return ITEM_OVERRIDES.get(request_t.endpoint, next(iter(request_t.return_type.__condenser_map__)))
+
+
+def parse_param(param: str) -> tuple[str, Any]:
+    key, sep, value = param.partition("=")
+    if not sep: raise argparse.ArgumentTypeError(f"Parameter {param!r} must be in the form key=value")
+    as_json = key.endswith(":")
+    if as_json: key = key[:-1]
+    if not (as_json or value.startswith(("[", "{", '"'))):
+        return key, value
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        raise argparse.ArgumentTypeError(f"Parameter {key!r} is not valid JSON: {value!r}")
+
+
+class JSONLWriter():
+    """Writes one JSON item per line. Progress is written after every page so exports can be resumed exactly.
+
+    Progress is kept in `<path>.progress`, or under `key` in `checkpoint` if given."""
+    def __init__(self, path: str, resume: bool, checkpoint: Checkpoint | None = None, key: str = "") -> None:
+        self.path = path
+        self.progress_path = f"{path}.progress"
+        self.checkpoint = checkpoint
+        self.key = f"export:{path}:{key}"
+        self.start_page = 1
+        mode = "wb"
+        progress = self._load_progress() if resume else None
+        if progress is not None:
+            self.start_page = progress["page"] + 1
+            mode = "r+b"
+        self.file = open(path, mode)
+        if mode == "r+b":
+            # Drop anything written after the last recorded page
+            self.file.truncate(progress["offset"])
+            self.file.seek(progress["offset"])
+
+    def write_page(self, page_no: int, items: list[SpeedrunModel]):
+        for item in items:
+            self.file.write(item.__pydantic_serializer__.to_json(item))
+            self.file.write(b"\n")
+        self.file.flush()
+        progress = {"page": page_no, "offset": self.file.tell()}
+        if self.checkpoint is not None:
+            self.checkpoint.set(self.key, progress)
+        else:
+            with open(self.progress_path, "w") as f:
+                json.dump(progress, f)
+
+    def _load_progress(self) -> dict | None:
+        if self.checkpoint is not None:
+            return self.checkpoint.get(self.key)
+        if not os.path.exists(self.progress_path): return None
+        with open(self.progress_path) as f:
+            return json.load(f)
+
+    def close(self, complete: bool):
+        self.file.close()
+        if not complete: return
+        if self.checkpoint is not None:
+            self.checkpoint.delete(self.key)
+        elif os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+
+
+def _arrow_type(pa: Any, annotation: Any) -> Any | None:
+    """Arrow type for a field annotation, or None if it should be stored as a JSON string."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(annotation) if a is not types.NoneType]
+        return _arrow_type(pa, args[0]) if len(args) == 1 else None
+    if typing.get_origin(annotation) is list:
+        inner = _arrow_type(pa, typing.get_args(annotation)[0])
+        return None if inner is None else pa.list_(inner)
+    if isinstance(annotation, type):
+        if issubclass(annotation, bool): return pa.bool_()
+        if issubclass(annotation, enum.StrEnum) or issubclass(annotation, str): return pa.string()
+        if issubclass(annotation, int): return pa.int64()
+        if issubclass(annotation, float): return pa.float64()
+    return None
+
+
+class ParquetWriter():
+    """Writes items to a Parquet file, one row group per page."""
+    def __init__(self, path: str, item_t: type[SpeedrunModel]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet export requires pyarrow; install with `pip install speedruncompy[export]`")
+        self.pa = pa
+        self.start_page = 1
+        fields, self.json_fields = [], set()
+        for name, info in item_t.model_fields.items():
+            arrow_t = _arrow_type(pa, info.annotation)
+            if arrow_t is None:
+                arrow_t = pa.string()
+                self.json_fields.add(name)
+            fields.append((name, arrow_t))
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_page(self, page_no: int, items: list[SpeedrunModel]):
+        rows = []
+        for item in items:
+            row = item.model_dump(mode="json")
+            for name in self.json_fields:
+                if row.get(name) is not None:
+                    row[name] = json.dumps(row[name], separators=(",", ":"))
+            rows.append(row)
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self, complete: bool):
+        self.writer.close()
+
+
+async def export(request: BasePaginatedRequest, output: str, format: str = "jsonl", concurrency: int = 4,
+                 resume: bool = False, max_pages: int = 0, retries: int = 5, checkpoint: Checkpoint | None = None) -> int:
+    """Export all pages of `request` to `output`. Returns the number of pages written."""
+    field = item_field(type(request))
+    if format == "parquet":
+        item_t = typing.get_args(request.return_type.model_fields[field].annotation)[0]
+        writer: JSONLWriter | ParquetWriter = ParquetWriter(output, item_t)
+    else:
+        writer = JSONLWriter(output, resume, checkpoint, request_key(request))
+
+    written, complete = 0, False
+    try:
+        async for page_no, page in request.iter_pages(retries=retries, max_pages=max_pages, concurrency=concurrency,
+                                                      start_page=writer.start_page):
+            writer.write_page(page_no, getattr(page, field) or [])
+            written += 1
+        complete = True
+    finally:
+        writer.close(complete)
+    return written
+
+
+def main(argv: list[str] | None = None):
+    available = paginated_endpoints()
+    parser = argparse.ArgumentParser(prog="srcompy-export", description="Export all pages of a paginated endpoint.")
+    parser.add_argument("endpoint", choices=sorted(available))
+    parser.add_argument("-p", "--param", action="append", type=parse_param, default=[], help="Request parameter as key=value, or key:=value for JSON")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("-f", "--format", choices=["jsonl", "parquet"], default=None, help="Defaults to the output's extension")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Maximum pages in flight")
+    parser.add_argument("-r", "--rate", type=float, default=None, help="Maximum requests per second")
+    parser.add_argument("--max-pages", type=int, default=0)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--resume", action="store_true", help="Resume a previous interrupted JSONL export")
+    parser.add_argument("--checkpoint", default=None, help="SQLite file to record progress in, instead of <output>.progress")
+    parser.add_argument("--phpsessid", default=os.environ.get("PHPSESSID"), help="Session for authed endpoints. Defaults to $PHPSESSID")
+    args = parser.parse_args(argv)
+
+    format = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    if format == "parquet" and args.resume:
+        parser.error("--resume is only supported for JSONL output")
+    if format == "parquet" and args.checkpoint is not None:
+        parser.error("--checkpoint is only supported for JSONL output")
+
+    client = SpeedrunClient("srcompy-export", PHPSESSID=args.phpsessid,
+                            rate_limiter=None if args.rate is None else RateLimiter(args.rate))
+    request = available[args.endpoint](_client=client, **dict(args.param))
+
+    checkpoint = None if args.checkpoint is None else Checkpoint(args.checkpoint)
+
+    async def run():
+        async with client:
+            return await export(request, args.output, format, args.concurrency, args.resume, args.max_pages, args.retries,
+                                checkpoint)
+
+    try:
+        pages = asyncio.run(run())
+    finally:
+        if checkpoint is not None: checkpoint.close()
+    print(f"Exported {pages} pages of {args.endpoint} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
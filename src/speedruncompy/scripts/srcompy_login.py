@@ -4,12 +4,26 @@ Basic script to login a new SRC session & get its session ID.
 Useful if you do not want to bother adding standard login code to your program & storing a username/password.
 
 Especially useful if you have 2FA enabled!
+
+With `--store PATH`, the session is saved for `auth.SessionStore(PATH)` instead of printed, and an existing stored session
+is reused if it is still logged in.
 """
 
-from speedruncompy import auth, api
+import argparse
+import asyncio
 from getpass import getpass
 
-def main():
+from speedruncompy import auth, api
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="srcompy-login", description="Log in to SRC and output the session ID.")
+    parser.add_argument("--store", default=None, help="Save the session to this file for use with auth.SessionStore")
+    args = parser.parse_args(argv)
+
+    if args.store is not None:
+        asyncio.run(_store_login(args.store))
+        return
+
     print("This script logs you in & returns a session ID for use with auth.loginPHPSESSID()")
     print("Please note that while your password is excluded from the terminal log, your PHPSESSID is not.")
     username = input("Enter username: ")
@@ -21,6 +35,22 @@ def main():
 
     print(api._default.PHPSESSID)
 
+async def _store_login(path: str):
+    client = api.SpeedrunClient("srcompy-login")
+    store = auth.SessionStore(path, _client=client)
+    async with client:
+        if await store.restore():
+            print(f"Stored session in {path} is still logged in")
+            return
+        username = input("Enter username: ")
+        password = getpass("Enter password: ")
+        if not await auth.login_async(username, password, client, tokenEntry=True):
+            print("Not logged in!")
+            exit()
+        store.csrfToken = await auth.get_CSRF_async(client)
+        store.save()
+    print(f"Session saved to {path}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,85 @@
+"""Opt-in identity map for entities that are repeated across many responses.
+
+Every response carries its own copies of the `User`s, `Game`s, `Category`s etc. it references. An `EntityStore` normalises
+responses so each entity exists once in memory, no matter how many responses refer to it.
+"""
+
+from typing import Any, Iterable, MutableMapping
+from weakref import WeakValueDictionary
+
+from .datatypes import SpeedrunModel, User, Player, Game, Platform, Region, Category, Level, Variable, Value
+
+DEFAULT_TYPES: tuple[type[SpeedrunModel], ...] = (User, Player, Game, Platform, Region, Category, Level, Variable, Value)
+
+
+class EntityStore():
+    """Identity map holding one canonical instance per (type, id).
+
+    `normalize()` swaps every tracked entity in a response for the canonical instance. When a newer copy of an entity arrives,
+    the canonical instance is updated in place, so every response holding it sees the update:
+    - Types with a `touchDate` (`User`, `Game`) only update when the incoming `touchDate` is newer.
+    - Other types take the most recently received copy.
+
+    Pass to `SpeedrunClient(entity_store=...)` to normalise every response automatically, or call `normalize()` directly.
+
+    By default entities are held weakly, and are dropped once no response references them."""
+
+    def __init__(self, types: Iterable[type[SpeedrunModel]] = DEFAULT_TYPES, weak: bool = True) -> None:
+        self.types = tuple(types)
+        self._entities: dict[type[SpeedrunModel], MutableMapping[str, SpeedrunModel]] = {
+            t: WeakValueDictionary() if weak else {} for t in self.types
+        }
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self._entities.values())
+
+    def get(self, type_: type[SpeedrunModel], id: str) -> SpeedrunModel | None:
+        return self._entities[type_].get(id)
+
+    def add(self, entity: SpeedrunModel) -> SpeedrunModel:
+        """Return the canonical instance for `entity`, registering or updating it as required."""
+        entities = self._entities[type(entity)]
+        canonical = entities.get(entity.id)  # type: ignore
+        if canonical is None:
+            entities[entity.id] = entity  # type: ignore
+            return entity
+        if canonical is not entity and self._is_newer(entity, canonical):
+            self._absorb(canonical, entity)
+        return canonical
+
+    def normalize(self, model: SpeedrunModel) -> SpeedrunModel:
+        """Replace every tracked entity within `model` with its canonical instance. Modifies and returns `model`."""
+        self._normalize_fields(model)
+        return model
+
+    @staticmethod
+    def _is_newer(incoming: SpeedrunModel, canonical: SpeedrunModel) -> bool:
+        incoming_touch = getattr(incoming, "touchDate", None)
+        canonical_touch = getattr(canonical, "touchDate", None)
+        if incoming_touch is not None and canonical_touch is not None:
+            return incoming_touch > canonical_touch
+        return incoming != canonical
+
+    @staticmethod
+    def _absorb(canonical: SpeedrunModel, incoming: SpeedrunModel):
+        canonical.__dict__.update(incoming.__dict__)
+        object.__setattr__(canonical, "__pydantic_extra__", incoming.__pydantic_extra__)
+        object.__setattr__(canonical, "__pydantic_fields_set__", set(incoming.__pydantic_fields_set__))
+
+    def _resolve(self, value: Any) -> Any:
+        if type(value) in self._entities:
+            return self.add(value)
+        if isinstance(value, SpeedrunModel):
+            self._normalize_fields(value)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._resolve(item)
+        return value
+
+    def _normalize_fields(self, model: SpeedrunModel):
+        for name in type(model).model_fields:
+            value = model.__dict__.get(name)
+            if value is not None:
+                model.__dict__[name] = self._resolve(value)
+        if model.__condenser_map__:
+            model.create_condensed_dicts()
@@ -0,0 +1,110 @@
+"""Keep local copies of leaderboards up to date by polling `GetLatestLeaderboard`.
+
+Boards are fetched once; afterwards each poll requests only a game's most recent runs and adds any not seen before
+to the matching board, instead of re-crawling whole categories:
+```python
+sync = LeaderboardSync()
+await sync.load("76rqmld8", "02q8o4p2")
+async for run in sync.watch(interval=300):
+    ...
+```
+If a poll finds no runs it has seen before, even at the largest `limit`, runs may have been missed; the game's boards
+are then re-fetched in full.
+
+`GetLatestLeaderboard` only lists newly verified runs, so edits, rejections & deletions of existing runs are not seen.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+from .api import SpeedrunClient
+from .datatypes import Run
+from .datatypes.enums import TimeDirection
+from .endpoints import GetLatestLeaderboard
+from .localboard import LocalLeaderboard
+
+MAX_LIMIT = 999
+"""Largest `limit` accepted by `GetLatestLeaderboard`."""
+
+BoardKey = tuple[str, str, str | None]
+"""`(gameId, categoryId, levelId)`"""
+
+
+class LeaderboardSync():
+    """A set of `LocalLeaderboard`s kept up to date from `GetLatestLeaderboard`.
+
+    `limit` is the number of recent runs requested per game on each poll; it is raised for a single poll when every
+    run returned is new."""
+    def __init__(self, _client: SpeedrunClient | None = None, limit: int = 20) -> None:
+        self._client = _client
+        self.limit = limit
+        self.boards: dict[BoardKey, LocalLeaderboard] = {}
+        self.seen: set[str] = set()
+        self._directions: dict[BoardKey, TimeDirection] = {}
+
+    @property
+    def games(self) -> set[str]:
+        return {gameId for gameId, _, _ in self.boards}
+
+    def track(self, board: LocalLeaderboard, gameId: str, categoryId: str, levelId: str | None = None):
+        """Start keeping an already fetched board up to date."""
+        key = (gameId, categoryId, levelId)
+        self.boards[key] = board
+        self._directions[key] = board.timeDirection
+        self.seen.update(run.id for run in board.runs)
+
+    async def load(self, gameId: str, categoryId: str, levelId: str | None = None,
+                   timeDirection: TimeDirection = TimeDirection.ASCENDING) -> LocalLeaderboard:
+        """Fetch a board in full and start keeping it up to date."""
+        board = await LocalLeaderboard.fetch(gameId, categoryId, levelId, timeDirection=timeDirection, _client=self._client)
+        self.track(board, gameId, categoryId, levelId)
+        return board
+
+    async def resync(self, gameId: str):
+        """Re-fetch every tracked board of a game. Boards are refreshed in place, so references to them stay current."""
+        keys = [key for key in self.boards if key[0] == gameId]
+        await asyncio.gather(*(self._refresh(key) for key in keys))
+
+    async def _refresh(self, key: BoardKey):
+        fresh = await LocalLeaderboard.fetch(*key, timeDirection=self._directions[key], _client=self._client)
+        self.boards[key].replace(fresh.runs)
+        self.seen.update(run.id for run in fresh.runs)
+
+    def apply(self, runs: list[Run]) -> list[Run]:
+        """Add unseen runs to their boards, returning the runs that were new."""
+        new = []
+        for run in runs:
+            if run.id in self.seen: continue
+            self.seen.add(run.id)
+            new.append(run)
+            board = self.boards.get((run.gameId, run.categoryId, run.levelId))
+            if board is not None:
+                board.add(run)
+        return new
+
+    async def poll_game(self, gameId: str) -> list[Run]:
+        """Poll a single game, returning its new runs."""
+        limit = self.limit
+        while True:
+            latest = await GetLatestLeaderboard(gameId=gameId, limit=limit, _client=self._client).perform()
+            runs = latest.runs
+            if len(runs) < limit or any(run.id in self.seen for run in runs):
+                return self.apply(runs)
+            if limit >= MAX_LIMIT:
+                new = [run for run in runs if run.id not in self.seen]
+                await self.resync(gameId)
+                self.seen.update(run.id for run in new)
+                return new
+            limit = min(limit * 4, MAX_LIMIT)
+
+    async def poll(self) -> list[Run]:
+        """Poll every tracked game once, returning all new runs."""
+        results = await asyncio.gather(*(self.poll_game(gameId) for gameId in self.games))
+        return [run for runs in results for run in runs]
+
+    async def watch(self, interval: float = 300) -> AsyncIterator[Run]:
+        """Poll every `interval` seconds forever, yielding new runs."""
+        while True:
+            for run in await self.poll():
+                yield run
+            await asyncio.sleep(interval)
@@ -0,0 +1,538 @@
+import asyncio
+import json
+import time
+
+from speedruncompy.datatypes import *
+from speedruncompy.datatypes.responses import *
+from speedruncompy.endpoints import *
+from speedruncompy.api import SpeedrunClient, RateLimiter, AdaptiveConcurrency, Priority, priority, CircuitBreaker, HedgePolicy, deadline
+from speedruncompy.cache import PagePlanner, ParseCache, ResponseCache, fingerprint
+from speedruncompy.auditlog import make_event
+from speedruncompy.exceptions import *
+from speedruncompy import api, config as srccfg
+
+import pytest
+
+from utils import FakeClient, StallingClient, leaderboard_page, make_run, paged_handler
+
+"""
+    Offline tests of the request machinery. `FakeClient` serves canned bodies instead of contacting SRC.
+"""
+
+class FakeStream():
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+
+    async def iter_chunked(self, n):
+        for c in self.chunks:
+            yield c
+
+class FakeResponse():
+    def __init__(self, chunks: list[bytes], content_length: int | None = None) -> None:
+        self.content = FakeStream(chunks)
+        self.content_length = content_length
+
+
+class TestParsing():
+    async def test_bytes_parse(self):
+        client = FakeClient(paged_handler(1))
+        result = await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert result._runDict["r1"].time == 1.0
+
+    async def test_chunked_read(self):
+        body = await SpeedrunClient._read(FakeResponse([b"ab", b"cd"]))  # type: ignore
+        assert body == b"abcd"
+
+    async def test_response_cap(self, monkeypatch):
+        monkeypatch.setattr(srccfg, "max_response_size", 3)
+        with pytest.raises(ResponseTooLarge):
+            await SpeedrunClient._read(FakeResponse([b"ab", b"cd"]))  # type: ignore
+        with pytest.raises(ResponseTooLarge):
+            await SpeedrunClient._read(FakeResponse([], content_length=4))  # type: ignore
+
+    async def test_error_body_preview(self):
+        client = FakeClient(lambda e, p: (b"x" * 100000, 400))
+        with pytest.raises(BadRequest) as e:
+            await GetGameData(gameId="g", _client=client).perform()
+        assert len(e.value.args[1]) < 100000
+
+
+class TestParseCache():
+    async def test_identical_body_shared(self):
+        cache = ParseCache()
+        client = FakeClient(paged_handler(1), parse_cache=cache)
+        first = await GetGameLeaderboard2("g", "c", _client=client).perform()
+        second = await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert first is second
+        assert cache.hits == 1 and cache.misses == 1
+
+    async def test_changed_body_revalidated(self):
+        cache = ParseCache(maxsize=1)
+        client = FakeClient(paged_handler(2), parse_cache=cache)
+        pages = await GetGameLeaderboard2("g", "c", _client=client)._perform_all_raw()
+        assert pages[1] is not pages[2]
+        assert cache.misses == 2 and len(cache) == 1
+
+    async def test_copy(self):
+        cache = ParseCache(copy=True)
+        client = FakeClient(paged_handler(1), parse_cache=cache)
+        first = await GetGameLeaderboard2("g", "c", _client=client).perform()
+        first.runList[0].time = -1
+        second = await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert first is not second and second.runList[0].time != -1
+        assert cache.hits == 1
+
+    async def test_endpoint_filter(self):
+        cache = ParseCache(endpoints=["GetStaticData"])
+        client = FakeClient(paged_handler(1), parse_cache=cache)
+        await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert len(cache) == 0
+
+
+class TestResponseCache():
+    async def test_served_until_invalidated(self):
+        cache = ResponseCache()
+        client = FakeClient(paged_handler(1), response_cache=cache)
+        a = GetGameLeaderboard2("g", "a", _client=client)
+        b = GetGameLeaderboard2("g", "b", _client=client)
+        for request in (a, a, b, b):
+            await request.perform()
+        assert len(client.calls) == 2 and cache.hits == 2
+
+        page = r_GetAuditLogList.model_validate_json(json.dumps({
+            "auditLogList": [{"id": "e", "date": 1, "eventType": "run-verified", "actorId": "u", "gameId": "g",
+                              "context": json.dumps({"runId": "r", "categoryId": "a"})}],
+            "userList": [], "gameList": [], "categoryList": [], "levelList": None, "variableList": [], "valueList": [],
+            "runList": [], "pagination": {"count": 1, "page": 1, "pages": 1, "per": 1}}))
+        cache.on_event(make_event(page.auditLogList[0], page))
+        await a.perform()
+        await b.perform()
+        assert len(client.calls) == 3
+
+    def test_touch_date(self):
+        cache = ResponseCache()
+        def game_data(touchDate: int):
+            return r_GetGameData.model_construct(game=Game.model_construct(id="g", touchDate=touchDate))
+        cache.put(fingerprint("GetGameData", {"gameId": "g"}), "GetGameData", {"gameId": "g"}, game_data(1))
+        cache.observe(game_data(1))
+        assert len(cache) == 1
+        cache.observe(game_data(2))
+        assert len(cache) == 0
+
+    async def test_endpoint_filter(self):
+        # Listings of recent activity are never invalidated by entity changes, so are not cached by default
+        assert not ResponseCache().accepts("GetLatestLeaderboard")
+        cache = ResponseCache(endpoints=["GetGameData"])
+        client = FakeClient(paged_handler(1), response_cache=cache)
+        for _ in range(2):
+            await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert len(client.calls) == 2 and len(cache) == 0
+
+    async def test_max_age(self):
+        client = FakeClient(paged_handler(1), response_cache=ResponseCache(max_age=0.02))
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        await request.perform()
+        await request.perform()
+        await asyncio.sleep(0.03)
+        await request.perform()
+        assert len(client.calls) == 2
+
+    def test_thread_dates(self):
+        cache = ResponseCache()
+        def thread(lastCommentDate: int) -> Thread:
+            return Thread.model_construct(id="t", lastCommentDate=lastCommentDate)
+        cache.put(fingerprint("GetThread", {"id": "t"}), "GetThread", {"id": "t"}, r_GetThread.model_construct(thread=thread(1)))
+        cache.observe(r_GetThreadList.model_construct(threadList=[thread(1)]))
+        assert len(cache) == 1
+        cache.observe(r_GetThreadList.model_construct(threadList=[thread(2)]))
+        assert len(cache) == 0
+
+    async def test_revalidate(self):
+        cache = ResponseCache(revalidate_after=0.01)
+        touchDate = 1
+        probes = []
+        class Probe():
+            endpoint, params = "GetGameData", {"gameId": "g"}
+            async def _perform(self, params, retries, delay):
+                probes.append(touchDate)
+                return r_GetGameData.model_construct(game=Game.model_construct(id="g", touchDate=touchDate))
+        cache.probe = lambda tag, _client=None: Probe()  # type: ignore
+        client = FakeClient(paged_handler(1), response_cache=cache)
+        board = GetGameLeaderboard2("g", "c", _client=client)
+        await board.perform()
+
+        await asyncio.sleep(0.02)
+        await board.perform()
+        assert len(probes) == 1 and len(client.calls) == 1
+        # Checked at most once per revalidate_after
+        await board.perform()
+        assert len(probes) == 1
+
+        touchDate = 2
+        await asyncio.sleep(0.02)
+        await board.perform()
+        assert len(probes) == 2 and len(client.calls) == 2
+
+    def test_fingerprint(self):
+        assert fingerprint("E", {"a": 1, "b": None, "vary": 0}) == fingerprint("E", {"a": 1})
+        assert fingerprint("E", {"a": 1, "c": 2}) == fingerprint("E", {"c": 2, "a": 1})
+
+
+class TestPagination():
+    async def test_iter_pages_order(self):
+        client = FakeClient(paged_handler(5))
+        pages = [(p, page.runList[0].id) async for p, page in GetGameLeaderboard2("g", "c", _client=client).iter_pages(concurrency=2)]
+        assert pages == [(p, f"r{p}") for p in range(1, 6)]
+
+    async def test_iter_pages_start(self):
+        client = FakeClient(paged_handler(5))
+        pages = [p async for p, _ in GetGameLeaderboard2("g", "c", _client=client).iter_pages(start_page=4)]
+        assert pages == [4, 5]
+        assert len(client.calls) == 2
+
+    async def test_failure_cancels_rest(self):
+        client = StallingClient([0, 0, 5, 5])
+        def handler(endpoint, params):
+            if params["page"] == 2: return b"", 404
+            return paged_handler(4)(endpoint, params)
+        client.handler = handler
+        start = time.monotonic()
+        with pytest.raises(NotFound):
+            await GetGameLeaderboard2("g", "c", _client=client).perform_all()
+        assert time.monotonic() - start < 1
+
+    async def test_tolerant(self):
+        served: dict[int, int] = {}
+        def handler(endpoint, params):
+            page = params["page"]
+            served[page] = served.get(page, 0) + 1
+            if page == 3 and served[page] == 1: return b"", 502
+            if page == 4: return b"", 404
+            return paged_handler(5)(endpoint, params)
+        client = FakeClient(handler)
+        pages, failures = await GetGameLeaderboard2("g", "c", _client=client).perform_all_tolerant(retries=0, delay=0)
+        assert list(pages) == [1, 2, 3, 5]
+        assert list(failures) == [4] and isinstance(failures[4], NotFound)
+        # Only the transiently failed page is refetched
+        assert served == {1: 1, 2: 1, 3: 2, 4: 1, 5: 1}
+
+    async def test_stop_when(self):
+        client = FakeClient(paged_handler(10))
+        stop_at_3 = lambda page: page.runList[0].id == "r3"
+        result = await GetGameLeaderboard2("g", "c", _client=client).perform_all(stop_when=stop_at_3)
+        assert [r.id for r in result.runList] == ["r1", "r2", "r3"]
+        assert len(client.calls) == 3
+
+        pages = [p async for p, _ in GetGameLeaderboard2("g", "c", _client=client).iter_pages(stop_when=stop_at_3)]
+        assert pages == [1, 2, 3]
+
+
+class TestRateLimiter():
+    async def test_rate(self):
+        limiter = RateLimiter(rate=100, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            await limiter.acquire()
+        # 2 burst requests are free, the remaining 4 are spaced by 10ms
+        assert time.monotonic() - start >= 0.035
+
+    async def test_client_limited(self):
+        client = FakeClient(paged_handler(3), rate_limiter=RateLimiter(rate=50))
+        start = time.monotonic()
+        await GetGameLeaderboard2("g", "c", _client=client).perform_all()
+        assert time.monotonic() - start >= 0.035
+
+
+    async def test_interactive_ahead_of_booked(self):
+        limiter = RateLimiter(rate=50)
+        order = []
+        async def send(name, level):
+            await limiter.acquire(level)
+            order.append(name)
+        bulk = [asyncio.ensure_future(send(f"b{i}", Priority.BULK)) for i in range(10)]
+        await asyncio.sleep(0.03)
+        start = time.monotonic()
+        await send("interactive", Priority.INTERACTIVE)
+        # Waits at most one turn, rather than behind every bulk request already waiting
+        assert time.monotonic() - start < 0.05
+        assert order.index("interactive") <= 3
+        await asyncio.gather(*bulk)
+
+    async def test_priority_without_concurrency(self):
+        client = FakeClient(paged_handler(12), rate_limiter=RateLimiter(rate=50))
+        crawl = asyncio.ensure_future(GetGameLeaderboard2("g", "bulk", _client=client).perform_all())
+        while len(client.calls) < 2:
+            await asyncio.sleep(0.001)
+        with priority(Priority.INTERACTIVE):
+            await GetGameLeaderboard2("g", "interactive", _client=client).perform()
+        await crawl
+        order = [params["params"]["categoryId"] for _, params in client.calls]
+        assert order.index("interactive") <= 3
+
+
+class TestAdaptiveConcurrency():
+    async def test_bounded_and_grows(self):
+        limiter = AdaptiveConcurrency(initial=2, maximum=6)
+        peak = 0
+        def handler(endpoint, params):
+            nonlocal peak
+            peak = max(peak, limiter.in_flight)
+            assert limiter.in_flight <= int(limiter.limit)
+            return paged_handler(1)(endpoint, params)
+
+        client = FakeClient(handler, concurrency=limiter)
+        await asyncio.gather(*(GetGameLeaderboard2("g", str(i), _client=client).perform() for i in range(60)))
+        assert limiter.in_flight == 0
+        assert limiter.limit > 2 and peak > 2
+
+    async def test_cut_on_server_error(self):
+        limiter = AdaptiveConcurrency(initial=8)
+        client = FakeClient(lambda e, p: (b"{}", 503), concurrency=limiter)
+        results = await asyncio.gather(*(GetGameLeaderboard2("g", "c", _client=client).perform(retries=0) for _ in range(8)),
+                                       return_exceptions=True)
+        assert all(isinstance(r, ServerException) for r in results)
+        # Failures of requests in flight together only count once
+        assert limiter.limit == 4
+
+    async def test_timeouts_do_not_grow(self):
+        limiter = AdaptiveConcurrency(initial=4)
+
+        class ExpiringClient(FakeClient):
+            async def _call(self, endpoint, params):
+                # The HTTP timeout derived from a deadline fires just as the deadline passes
+                self.calls.append((endpoint, params))
+                api._deadline.set(asyncio.get_running_loop().time())
+                raise asyncio.TimeoutError()
+
+        stalling, expiring = StallingClient([5] * 80, concurrency=limiter), ExpiringClient(paged_handler(1), concurrency=limiter)
+        for _ in range(10):
+            with pytest.raises(TimeoutError):
+                async with deadline(0.005):
+                    await asyncio.gather(*(GetGameLeaderboard2("g", str(i), _client=stalling).perform() for i in range(8)))
+            await asyncio.gather(*(GetGameLeaderboard2("g", str(i), _client=expiring).perform(retries=0) for i in range(8)),
+                                 return_exceptions=True)
+        assert len(expiring.calls) == 80
+        assert limiter.in_flight == 0
+        assert limiter.limit <= 4 and len(limiter._latencies) == 0
+
+    def test_cut_on_latency(self):
+        limiter = AdaptiveConcurrency(initial=8, window=20)
+        for _ in range(20):
+            limiter.in_flight += 1
+            limiter.release(0.01, failed=False)
+        limit = limiter.limit
+        for _ in range(20):
+            limiter.in_flight += 1
+            limiter.release(0.5, failed=False)
+        assert limiter.limit < limit
+
+
+class TestPriority():
+    async def test_interactive_first(self):
+        limiter = AdaptiveConcurrency(initial=1, maximum=1)
+        client = FakeClient(paged_handler(6), concurrency=limiter)
+        crawl = asyncio.ensure_future(GetGameLeaderboard2("g", "bulk", _client=client).perform_all())
+        while len(limiter._waiters) < 4:
+            await asyncio.sleep(0)
+
+        with priority(Priority.INTERACTIVE):
+            await GetGameLeaderboard2("g", "interactive", _client=client).perform()
+        await crawl
+        order = [params["params"]["categoryId"] for _, params in client.calls]
+        # Page 1 of the crawl and at most one queued page go before the interactive request
+        assert order.index("interactive") <= 2
+
+    async def test_explicit_priority_kept(self):
+        limiter = AdaptiveConcurrency(initial=1, maximum=1)
+        seen = []
+        original = limiter.acquire
+        async def acquire(level=Priority.NORMAL):
+            seen.append(level)
+            await original(level)
+        limiter.acquire = acquire  # type: ignore
+        client = FakeClient(paged_handler(3), concurrency=limiter)
+        await GetGameLeaderboard2("g", "c", _client=client).perform_all()
+        with priority(Priority.INTERACTIVE):
+            await GetGameLeaderboard2("g", "c", _client=client).perform_all()
+        assert seen == [Priority.NORMAL, Priority.BULK, Priority.BULK] + [Priority.INTERACTIVE] * 3
+
+
+class TestCircuitBreaker():
+    async def test_opens_and_probes(self):
+        breaker = CircuitBreaker(threshold=3, cooldown=0.05)
+        status = 503
+        client = FakeClient(lambda e, p: (leaderboard_page(1, 1, [make_run("r")]), status), circuit_breaker=breaker)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        # Retries stop as soon as the circuit opens
+        with pytest.raises(CircuitOpen):
+            await request.perform(retries=10, delay=0)
+        assert len(client.calls) == 3 and breaker.state == CircuitBreaker.OPEN
+
+        await asyncio.sleep(0.06)
+        with pytest.raises(ServerException):
+            await request.perform(retries=0)
+        assert len(client.calls) == 4 and breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpen):
+            await request.perform(retries=0)
+
+        await asyncio.sleep(0.06)
+        status = 200
+        await request.perform()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    async def test_stale_served_when_open(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=60)
+        cache = ResponseCache()
+        status = 200
+        client = FakeClient(lambda e, p: (leaderboard_page(1, 1, [make_run("r")]), status),
+                            circuit_breaker=breaker, response_cache=cache)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        first = await request.perform()
+        cache.invalidate(("gameId", "g"))
+        status = 503
+        with pytest.raises(ServerException):
+            await request.perform(retries=0)
+        assert await request.perform() is first
+        assert await GetGameLeaderboard2("g", "c", _client=client).perform() is first
+        with pytest.raises(CircuitOpen):
+            await GetGameLeaderboard2("g", "other", _client=client).perform()
+
+
+class TestHedging():
+    async def test_hedge_wins(self):
+        policy = HedgePolicy(endpoints=["GetGameLeaderboard2"], delay=0.02)
+        client = StallingClient([5], hedge=policy)
+        start = time.monotonic()
+        await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert time.monotonic() - start < 1
+        assert len(client.calls) == 2 and policy.wins == 1
+
+    async def test_extra_load_capped(self):
+        policy = HedgePolicy(delay=0.01, max_extra=0, burst=1)
+        client = StallingClient([0.05] * 4, hedge=policy)
+        for _ in range(3):
+            await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert policy.hedged == 1 and len(client.calls) == 4
+
+    async def test_delay_from_percentile(self):
+        policy = HedgePolicy(percentile=0.5, min_samples=4)
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            policy.record("E", latency)
+        assert policy.hedge_after("E") == 0.3
+        assert policy.hedge_after("Other") == policy.delay
+
+
+class TestDeadline():
+    async def test_learns_stalled_latency(self):
+        # Every first attempt takes 0.03s; every hedge answers at once
+        policy = HedgePolicy(delay=0.01, min_samples=5, burst=100)
+        client = StallingClient([0.03, 0] * 15, hedge=policy)
+        for _ in range(15):
+            await GetGameLeaderboard2("g", "c", _client=client).perform()
+        assert policy.hedged == 15
+        assert policy.hedge_after("GetGameLeaderboard2") >= 0.01
+
+    async def test_stalled_request(self):
+        client = StallingClient([5])
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await GetGameLeaderboard2("g", "c", _client=client).perform(timeout=0.05)
+        assert time.monotonic() - start < 1
+
+    async def test_includes_retry_delays(self):
+        client = FakeClient(lambda e, p: (b"{}", 503))
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await GetGameLeaderboard2("g", "c", _client=client).perform(delay=1, timeout=0.05)
+        assert time.monotonic() - start < 1
+
+    async def test_partial_pages(self):
+        client = StallingClient([0, 0, 5])
+        client.handler = paged_handler(5)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        with pytest.raises(TimeoutError):
+            await request._perform_all_raw(timeout=0.05)
+        client.calls.clear()
+        pages = await request._perform_all_raw(timeout=0.05, partial=True)
+        assert list(pages) == [1, 2, 4, 5]
+
+    async def test_nested_deadline(self):
+        client = StallingClient([0.2])
+        async with deadline(10):
+            with pytest.raises(TimeoutError):
+                async with deadline(0.05):
+                    await GetGameLeaderboard2("g", "c", _client=client).perform()
+            await GetGameLeaderboard2("g", "c", _client=client).perform()
+
+    def test_sync(self):
+        client = StallingClient([5])
+        with pytest.raises(TimeoutError):
+            GetGameLeaderboard2("g", "c", _client=client).perform_sync(timeout=0.05)
+
+
+class TestPagePlanner():
+    async def test_empty_board(self):
+        client = FakeClient(lambda e, p: (leaderboard_page(1, 0, []), 200), page_planner=PagePlanner())
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        for _ in range(2):
+            assert (await request.perform_all()).runList == []
+
+    async def test_known_count_fetched_at_once(self):
+        planner = PagePlanner()
+        client = StallingClient([0.1] * 6, page_planner=planner)
+        client.handler = paged_handler(3)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        start = time.monotonic()
+        first = await request.perform_all()
+        # Page 2 is speculated alongside page 1, then page 3 is fetched once the count is known
+        assert time.monotonic() - start >= 0.2
+        start = time.monotonic()
+        second = await request.perform_all()
+        assert time.monotonic() - start < 0.2
+        assert [r.id for r in first.runList] == [r.id for r in second.runList] == ["r1", "r2", "r3"]
+        assert planner.hits == 1 and planner.misses == 1
+
+    async def test_reconcile(self):
+        planner = PagePlanner()
+        board_pages = 4
+        client = FakeClient(lambda e, p: paged_handler(board_pages)(e, p), page_planner=planner)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        assert len(await request._perform_all_raw()) == 4
+
+        board_pages = 2
+        assert list(await request._perform_all_raw()) == [1, 2]
+        assert planner.wasted == 2
+
+        board_pages = 3
+        assert list(await request._perform_all_raw()) == [1, 2, 3]
+        assert list(await request._perform_all_raw(max_pages=2)) == [1, 2]
+
+    async def test_speculative_failure_ignored(self):
+        def handler(endpoint, params):
+            if params["page"] == 2: return b"", 400
+            return paged_handler(1)(endpoint, params)
+        client = FakeClient(handler, page_planner=PagePlanner())
+        pages = await GetGameLeaderboard2("g", "c", _client=client)._perform_all_raw()
+        assert list(pages) == [1]
+
+    async def test_partial_needs_first_page(self):
+        planner = PagePlanner()
+        client = StallingClient([0, 0, 0, 5, 0, 0], page_planner=planner)
+        client.handler = paged_handler(3)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        await request.perform_all()
+        # Page 1 stalls while the expected pages 2 & 3 arrive
+        with pytest.raises(TimeoutError):
+            await request.perform_all(timeout=0.1, partial=True)
+
+    async def test_partial_drops_pages_past_end(self):
+        planner = PagePlanner()
+        board_pages = 4
+        client = StallingClient([0] * 4 + [0.03, 5, 0, 0], page_planner=planner)
+        client.handler = lambda e, p: paged_handler(board_pages)(e, p)
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        await request.perform_all()
+        # The board shrinks to 3 pages; page 4 arrives before page 1 and page 2 stalls
+        board_pages = 3
+        pages = await request._perform_all_raw(timeout=0.1, partial=True)
+        assert list(pages) == [1, 3]
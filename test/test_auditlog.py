@@ -0,0 +1,70 @@
+import json
+
+from speedruncompy.auditlog import AuditLogTailer, AuditEvent, AuditGap, RunEvent, ModeratorEvent
+from speedruncompy.checkpoint import Checkpoint
+
+from utils import FakeClient, make_run
+
+
+def entry(id: str, date: int, eventType: str, **context) -> dict:
+    return {"id": id, "date": date, "eventType": eventType, "actorId": "u", "gameId": "g", "context": json.dumps(context)}
+
+def audit_page(page: int, pages: int, entries: list[dict], runs: list[dict] = []) -> bytes:
+    return json.dumps({"auditLogList": entries, "userList": [], "gameList": [], "categoryList": [], "levelList": None,
+                       "variableList": [], "valueList": [], "runList": runs,
+                       "pagination": {"count": 0, "page": page, "pages": pages, "per": 2}}).encode()
+
+
+class TestAuditLogTailer():
+    async def test_tail(self):
+        log = [entry("e2", 20, "category-updated"), entry("e1", 10, "game-updated")]
+
+        def handler(endpoint, params):
+            page = params["page"]
+            pages = (len(log) + 1) // 2
+            return audit_page(page, pages, log[(page - 1) * 2:page * 2], [make_run("r1")]), 200
+
+        client = FakeClient(handler)
+        tailer = AuditLogTailer(gameIds=["g"], _client=client)
+        assert await tailer.poll() == []
+        assert tailer.cursors["g"] == (20, ["e2"])
+
+        log[:0] = [entry("e5", 40, "game-moderator-created"), entry("e4", 30, "run-verified", runId="r1"),
+                   entry("e3", 20, "something-new")]
+        client.calls.clear()
+        events = await tailer.poll()
+        assert [(type(e), e.id) for e in events] == [(AuditEvent, "e3"), (RunEvent, "e4"), (ModeratorEvent, "e5")]
+        assert events[1].run is not None and events[1].run.id == "r1"
+        # Page 2 reaches the cursor, so page 3 is never requested
+        assert [params["page"] for _, params in client.calls] == [1, 2]
+        assert tailer.cursors["g"] == (40, ["e5"])
+
+        assert await tailer.poll() == []
+
+    async def test_checkpoint(self):
+        log = [entry("e1", 10, "game-updated")]
+        client = FakeClient(lambda endpoint, params: (audit_page(1, 1, log), 200))
+        checkpoint = Checkpoint(":memory:")
+        tailer = AuditLogTailer(gameIds=["g"], _client=client, checkpoint=checkpoint)
+        await tailer.poll()
+        assert checkpoint.get("auditlog:g") is None
+        tailer.save()
+
+        log.insert(0, entry("e2", 20, "game-updated"))
+        restarted = AuditLogTailer(gameIds=["g"], _client=client, checkpoint=checkpoint)
+        assert [e.id for e in await restarted.poll()] == ["e2"]
+
+    async def test_gap(self):
+        log = [entry("e1", 10, "game-updated")]
+        def handler(endpoint, params):
+            page = params["page"]
+            pages = (len(log) + 1) // 2
+            return audit_page(page, pages, log[(page - 1) * 2:page * 2]), 200
+
+        tailer = AuditLogTailer(gameIds=["g"], _client=FakeClient(handler), max_pages=2)
+        await tailer.poll()
+        log[:0] = [entry(f"n{i}", 100 - i, "game-updated") for i in range(6)]
+        events = await tailer.poll()
+        # Only 4 of the 6 new entries fit in 2 pages; the rest are reported as a gap before them
+        assert isinstance(events[0], AuditGap) and (events[0].after, events[0].before) == (10, 97)
+        assert [e.id for e in events[1:]] == ["n3", "n2", "n1", "n0"]
@@ -0,0 +1,63 @@
+import json
+import os
+
+from speedruncompy import auth
+from speedruncompy.exceptions import AIOException
+
+from utils import FakeClient, session
+
+import pytest
+
+
+class TestSessionStore():
+    async def test_restore(self, tmp_path):
+        path = str(tmp_path / "session.json")
+        with open(path, "w") as f:
+            json.dump({"PHPSESSID": "abc", "csrfToken": "old"}, f)
+
+        client = FakeClient(lambda e, p: (session("new"), 200))
+        store = auth.SessionStore(path, _client=client)
+        assert await store.ensure("user", "pwd")
+        assert client.PHPSESSID == "abc" and store.csrfToken == "new"
+        assert [e for e, _ in client.calls] == ["GetSession"]
+        assert store.load() == {"PHPSESSID": "abc", "csrfToken": "new"}
+
+    async def test_expired_logs_in(self, tmp_path):
+        path = str(tmp_path / "session.json")
+        with open(path, "w") as f:
+            json.dump({"PHPSESSID": "expired", "csrfToken": "old"}, f)
+
+        signed_in = False
+        def handler(endpoint, params):
+            nonlocal signed_in
+            if endpoint == "PutAuthLogin":
+                signed_in = True
+                client.PHPSESSID = "fresh"
+                return json.dumps({"loggedIn": True, "tokenChallengeSent": False}).encode(), 200
+            return session("t", signedIn=signed_in), 200
+
+        client = FakeClient(handler)
+        store = auth.SessionStore(path, _client=client)
+        assert await store.ensure("user", "pwd")
+        assert [e for e, _ in client.calls] == ["GetSession", "PutAuthLogin", "GetSession"]
+        assert store.load() == {"PHPSESSID": "fresh", "csrfToken": "t"}
+        assert oct(os.stat(path).st_mode & 0o777) == oct(0o600)
+
+    async def test_missing_without_credentials(self, tmp_path):
+        store = auth.SessionStore(str(tmp_path / "none.json"), _client=FakeClient(lambda e, p: (session("t"), 200)))
+        assert not await store.ensure()
+
+
+class TestAsyncAuth():
+    async def test_get_CSRF_async(self):
+        client = FakeClient(lambda e, p: (session("t"), 200))
+        assert await auth.get_CSRF_async(client) == "t"
+
+    async def test_sync_in_loop(self):
+        with pytest.raises(AIOException):
+            auth.get_CSRF(FakeClient(lambda e, p: (session("t"), 200)))
+
+    def test_sync_uses_client(self):
+        client = FakeClient(lambda e, p: (session("t"), 200))
+        assert auth.get_CSRF(client) == "t"
+        assert len(client.calls) == 1
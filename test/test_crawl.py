@@ -0,0 +1,96 @@
+from speedruncompy.datatypes import *
+from speedruncompy.datatypes.responses import *
+from speedruncompy.crawl import plan_leaderboards, crawl_leaderboards
+from speedruncompy.checkpoint import Checkpoint
+
+from utils import FakeClient, leaderboard_page, make_run
+
+
+def category(id: str, isPerLevel: bool = False, archived: bool = False) -> Category:
+    return Category.model_construct(id=id, pos=0, isPerLevel=isPerLevel, archived=archived)
+
+def level(id: str) -> Level:
+    return Level.model_construct(id=id, pos=0, archived=False)
+
+def variable(id: str, categoryId: str | None = None, levelScope: VarLevelScope = VarLevelScope.ALL, levelId: str | None = None,
+             isSubcategory: bool = True) -> Variable:
+    return Variable.model_construct(id=id, pos=0, categoryScope=VarCategoryScope.ALL if categoryId is None else VarCategoryScope.SINGLE,
+                                    categoryId=categoryId, levelScope=levelScope, levelId=levelId,
+                                    isSubcategory=isSubcategory, archived=False)
+
+def value(id: str, variableId: str, archived: bool = False) -> Value:
+    return Value.model_construct(id=id, pos=0, variableId=variableId, archived=archived)
+
+def game_data(categories, levels=[], variables=[], values=[]) -> r_GetGameData:
+    return r_GetGameData.model_construct(game=Game.model_construct(id="g"), categories=categories, levels=levels,
+                                         variables=variables, values=values)
+
+def board_key(request) -> tuple:
+    params = request.params["params"]
+    return (params["categoryId"], params["levelId"], tuple(tuple(v.valueIds) for v in params["values"] or []))
+
+
+class TestPlanner():
+    def test_categories(self):
+        data = game_data([category("a"), category("b"), category("x", archived=True)])
+        assert [board_key(r) for r in plan_leaderboards(data)] == [("a", None, ()), ("b", None, ())]
+
+    def test_subcategories(self):
+        data = game_data([category("a"), category("b")],
+                         variables=[variable("v", categoryId="a"), variable("w", isSubcategory=False)],
+                         values=[value("v1", "v"), value("v2", "v"), value("w1", "w")])
+        assert [board_key(r) for r in plan_leaderboards(data)] == [("a", None, (("v1",),)), ("a", None, (("v2",),)), ("b", None, ())]
+
+    def test_levels(self):
+        data = game_data([category("il", isPerLevel=True)], levels=[level("l1"), level("l2")])
+        assert [board_key(r) for r in plan_leaderboards(data)] == [("il", "l1", ()), ("il", "l2", ())]
+
+    def test_level_scopes(self):
+        data = game_data([category("fg"), category("il", isPerLevel=True)], levels=[level("l1"), level("l2")],
+                         variables=[variable("full", levelScope=VarLevelScope.FULL_GAME),
+                                    variable("single", levelScope=VarLevelScope.SINGLE_LEVEL, levelId="l2")],
+                         values=[value("f1", "full"), value("f2", "full"), value("s1", "single"), value("s2", "single")])
+        assert [board_key(r) for r in plan_leaderboards(data)] == [
+            ("fg", None, (("f1",),)), ("fg", None, (("f2",),)),
+            ("il", "l1", ()),
+            ("il", "l2", (("s1",),)), ("il", "l2", (("s2",),)),
+        ]
+
+    def test_archived_values(self):
+        """A subcategory with no live values must not drop the category."""
+        data = game_data([category("a")], variables=[variable("v")], values=[value("v1", "v", archived=True)])
+        assert [board_key(r) for r in plan_leaderboards(data)] == [("a", None, ())]
+
+
+def crawl_handler(endpoint, params):
+    page = params.get("page") or 1
+    category_id = params["params"]["categoryId"]
+    # Board "a" has 3 pages, board "b" repeats a run from board "a"
+    if category_id == "a":
+        return leaderboard_page(page, 3, [make_run(f"a{page}")]), 200
+    return leaderboard_page(page, 1, [make_run("a1"), make_run("b1")]), 200
+
+
+class TestCrawler():
+    async def test_crawl_dedupes(self):
+        client = FakeClient(crawl_handler)
+        requests = plan_leaderboards(game_data([category("a"), category("b")]), _client=client)
+        runs = [run.id async for run in crawl_leaderboards(requests, concurrency=2)]
+        assert sorted(runs) == ["a1", "a2", "a3", "b1"]
+        assert len(client.calls) == 4
+
+    async def test_resume(self, tmp_path):
+        path = str(tmp_path / "crawl.sqlite")
+        client = FakeClient(crawl_handler)
+        requests = plan_leaderboards(game_data([category("a"), category("b")]), _client=client)
+        with Checkpoint(path) as checkpoint:
+            crawl = crawl_leaderboards(requests, concurrency=1, checkpoint=checkpoint)
+            assert [(await anext(crawl)).id, (await anext(crawl)).id] == ["a1", "a2"]
+            # Interrupted while page 2 of board "a" was being handled
+            await crawl.aclose()
+
+        client.calls.clear()
+        with Checkpoint(path) as checkpoint:
+            runs = [run.id async for run in crawl_leaderboards(requests, concurrency=1, checkpoint=checkpoint)]
+        assert runs == ["a2", "a3", "a1", "b1"]
+        assert [(params["params"]["categoryId"], params["page"]) for _, params in client.calls] == [("a", 2), ("a", 3), ("b", 1)]
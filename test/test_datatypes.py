@@ -8,6 +8,10 @@ from speedruncompy.datatypes import *
 from speedruncompy import config as srccfg
 from speedruncompy.endpoints import *
 from speedruncompy.exceptions import IncompleteDatatype, IncompleteEnum
+from speedruncompy.store import EntityStore
+from speedruncompy.columnar import RunTable
+from speedruncompy.export import runs_to_numpy, runs_to_arrow
+from speedruncompy.datatypes._impl import _InternTable
 
 from utils import check_model_coverage
 
@@ -84,6 +88,101 @@ class TestModels():
             check_model_coverage(varVal2)
 
 
+class TestInterning():
+    @staticmethod
+    def make_run(id: str) -> Run:
+        # Build the id strings at runtime so they are distinct objects before interning
+        return Run.model_validate({"id": id, "gameId": "".join(["g", "1"]), "categoryId": "c", "emulator": False, "verified": 1,
+                                   "date": 100, "hasSplits": False, "playerIds": ["".join(["p", "1"])], "valueIds": [], "videoState": 0})
+
+    async def test_intern_disabled(self):
+        a, b = self.make_run("a"), self.make_run("b")
+        assert a.gameId == b.gameId and a.gameId is not b.gameId
+
+    async def test_intern_enabled(self, monkeypatch):
+        monkeypatch.setattr(srccfg, "intern_ids", True)
+        a, b = self.make_run("a"), self.make_run("b")
+        assert a.gameId is b.gameId
+        assert a.playerIds[0] is b.playerIds[0]
+        assert "id" not in Run.__intern_fields__
+
+    async def test_intern_table_bounded(self, monkeypatch):
+        monkeypatch.setattr(srccfg, "intern_table_size", 2)
+        table = _InternTable()
+        for s in ("a", "b", "c"):
+            table(s)
+        assert len(table) == 1
+
+
+class TestEntityStore():
+    @staticmethod
+    def make_user(name: str, touchDate: int) -> User:
+        return User(id="u", name=name, url=name, pronouns=[], powerLevel=SitePowerLevel.USER, color1Id="c", areaId="a",
+                    iconType=IconType.NONE, onlineDate=0, signupDate=0, touchDate=touchDate, staticAssets=[])
+
+    @staticmethod
+    def make_page(*players: Player) -> r_GetGameLeaderboard2:
+        return r_GetGameLeaderboard2(runList=[], playerList=list(players), platformList=[], pagination=Pagination(count=1, page=1, pages=1, per=1))
+
+    async def test_identity(self):
+        store = EntityStore()
+        page_a = store.normalize(self.make_page(Player(id="p", name="a")))
+        page_b = store.normalize(self.make_page(Player(id="p", name="a")))
+        assert page_a.playerList[0] is page_b.playerList[0]
+        assert page_b._playerDict["p"] is page_a.playerList[0]
+
+    async def test_touchDate_update(self):
+        store = EntityStore()
+        canonical = store.add(self.make_user("old", 1))
+        assert store.add(self.make_user("older", 0)) is canonical and canonical.name == "old"
+        assert store.add(self.make_user("new", 2)) is canonical and canonical.name == "new"
+
+
+class TestRunTable():
+    async def test_roundtrip(self):
+        runs = [
+            Run(id="a", gameId="g", categoryId="c", time=1.5, emulator=False, verified=Verified.VERIFIED, date=100, hasSplits=False, playerIds=["p", "q"], valueIds=["v"], videoState=VideoState.UNKNOWN, place=1),
+            Run(id="b", gameId="g", categoryId="c", igt=2, emulator=True, verified=Verified.PENDING, date=200, hasSplits=False, playerIds=["p"], valueIds=[], videoState=VideoState.UNKNOWN),
+        ]
+        page = r_GetGameLeaderboard2(runList=runs, playerList=[], platformList=[], pagination=Pagination(count=2, page=1, pages=1, per=2))
+        table = RunTable.from_pages([page])
+        
+        assert len(table) == 2
+        assert table.gameId.values == ["g"] and table.playerIds.items.values == ["p", "q"]
+        for run, row in zip(runs, table):
+            for k, v in row.items():
+                assert getattr(run, k) == v, k
+
+
+class TestExport():
+    @pytest.fixture()
+    def leaderboard(self) -> Leaderboard:
+        runs = [
+            Run(id="a", gameId="g", categoryId="c", time=1.5, emulator=False, verified=Verified.VERIFIED, date=100, hasSplits=False, playerIds=["p"], valueIds=["v"], videoState=VideoState.UNKNOWN, platformId="pc", place=1),
+            Run(id="b", gameId="g", categoryId="c", igt=2, emulator=True, verified=Verified.VERIFIED, date=200, hasSplits=False, playerIds=["p", "x"], valueIds=[], videoState=VideoState.UNKNOWN),
+        ]
+        return Leaderboard.model_construct(
+            runs=runs, players=[Player(id="p", name="Player")], platforms=[Platform(id="pc", name="PC", url="pc", year=1)], regions=[],
+            values=[Value(id="v", name="Glitchless", url="v", pos=0, variableId="var", archived=False)],
+            variables=[], pagination=Pagination(count=2, page=1, pages=1, per=2)).create_condensed_dicts()
+
+    async def test_numpy(self, leaderboard: Leaderboard):
+        pytest.importorskip("numpy")
+        array = runs_to_numpy(leaderboard)
+        assert list(array["id"]) == ["a", "b"]
+        assert array["time"][0] == 1.5 and array["time"][1] != array["time"][1]
+        assert array["platformName"][0] == "PC"
+        assert array["playerNames"][1] == ["Player", None]
+        assert array["values"][0] == {"var": "Glitchless"}
+
+    async def test_arrow(self, leaderboard: Leaderboard):
+        pytest.importorskip("pyarrow")
+        table = runs_to_arrow(r_GetGameLeaderboard.model_construct(leaderboard=leaderboard))
+        assert table.num_rows == 2
+        assert table.column("time").to_pylist() == [1.5, None]
+        assert table.column("values").to_pylist()[0] == [("var", "Glitchless")]
+
+
 @pytest.mark.skipif(SKIP_HEAVY_TESTS, reason="SKIP_HEAVY_TESTS == True")
 class TestDatatypes_Integration_Heavy():
     """
@@ -0,0 +1,108 @@
+from speedruncompy.datatypes import *
+import json
+
+from speedruncompy.localboard import LocalLeaderboard
+from speedruncompy.sync import LeaderboardSync
+
+from utils import FakeClient, leaderboard_page, make_run
+
+
+def run(id: str, time: float, players: list[str], **kwargs) -> Run:
+    return Run.model_validate(make_run(id, time=time, playerIds=players, **kwargs))
+
+def places(runs: list[Run]) -> list[tuple[str, int | None]]:
+    return [(r.id, r.place) for r in runs]
+
+
+class TestLocalLeaderboard():
+    board = LocalLeaderboard([
+        run("a", 10, ["p1"], platformId="pc", date=100000),
+        run("b", 12, ["p1"], platformId="console", date=200),
+        run("c", 11, ["p2"], platformId="console", emulator=True, date=100),
+        run("d", 11, ["p3"], platformId="pc", date=50),
+        run("e", 9, ["p4"], verified=0),
+        run("f", 13, ["p5"], timeWithLoads=14, valueIds=["v2"]),
+    ])
+
+    def test_default(self):
+        assert places(self.board.view()) == [("a", 1), ("d", 2), ("c", 2), ("f", 4)]
+
+    def test_obsolete(self):
+        assert places(self.board.view(obsolete=ObsoleteFilter.SHOWN)) == [("a", 1), ("d", 2), ("c", 2), ("b", None), ("f", 4)]
+        assert places(self.board.view(obsolete=ObsoleteFilter.EXCLUSIVE)) == [("b", None)]
+
+    def test_platform_reranks(self):
+        """Run `b` is obsolete overall, but is p1's best on console."""
+        assert places(self.board.view(platformIds=["console"])) == [("c", 1), ("b", 2)]
+
+    def test_filters(self):
+        assert places(self.board.view(emulator=EmulatorFilter.HIDDEN)) == [("a", 1), ("d", 2), ("f", 3)]
+        assert places(self.board.view(values=[VarValues(variableId="x", valueIds=["v1", "v2"])])) == [("f", 1)]
+        assert places(self.board.view(dateTo="1970-01-01")) == [("d", 1), ("c", 1), ("b", 3), ("f", 4)]
+        assert places(self.board.view(verified=VerifiedFilter.AWAITING)) == [("e", 1)]
+
+    def test_timers(self):
+        # Runs without LRT are ranked by their RTA, held in `time`
+        assert places(self.board.view(timer=TimerName.timeWithLoads)) == [("a", 1), ("d", 2), ("c", 2), ("f", 4)]
+        board = LocalLeaderboard([run("a", 5, ["p1"], igt=0.0), run("b", 5, ["p2"], igt=1.0), run("c", 5, ["p3"])])
+        assert places(board.view(timer=TimerName.igt)) == [("a", 1), ("b", 2)]
+
+    def test_direction(self):
+        assert places(self.board.view(timeDirection=TimeDirection.DESCENDING))[0] == ("f", 1)
+
+
+def latest(runs: list[dict]) -> bytes:
+    return json.dumps({"categories": [], "games": [], "levels": [], "players": [], "regions": [], "runs": runs,
+                       "values": [], "variables": [], "platforms": []}).encode()
+
+
+class TestSync():
+    async def test_patches_boards(self):
+        recent = [make_run("r1", time=5.0)]
+        board_runs = [make_run("r1", time=5.0), make_run("r0", time=8.0, playerIds=["q"])]
+
+        def handler(endpoint, params):
+            if endpoint == "GetLatestLeaderboard":
+                return latest(recent[:params["limit"]]), 200
+            return leaderboard_page(1, 1, board_runs), 200
+
+        client = FakeClient(handler)
+        sync = LeaderboardSync(_client=client, limit=2)
+        board = await sync.load("g", "c")
+        assert await sync.poll() == []
+
+        recent.insert(0, make_run("r2", time=3.0, playerIds=["z"]))
+        assert [r.id for r in await sync.poll()] == ["r2"]
+        assert [(r.id, r.place) for r in board.view()] == [("r2", 1), ("r1", 2), ("r0", 3)]
+        assert sum(1 for endpoint, _ in client.calls if endpoint == "GetGameLeaderboard2") == 1
+
+    async def test_raises_limit(self):
+        recent = [make_run(f"n{i}") for i in range(3)]
+
+        def handler(endpoint, params):
+            return latest(recent[:params["limit"]]), 200
+
+        client = FakeClient(handler)
+        sync = LeaderboardSync(_client=client, limit=1)
+        sync.track(LocalLeaderboard([]), "g", "c")
+        assert len(await sync.poll()) == 3
+        assert len(sync.boards[("g", "c", None)]) == 3
+        assert [params["limit"] for _, params in client.calls] == [1, 4]
+
+    async def test_gap_resyncs(self, monkeypatch):
+        monkeypatch.setattr("speedruncompy.sync.MAX_LIMIT", 2)
+        recent = [make_run(f"n{i}") for i in range(3)]
+
+        def handler(endpoint, params):
+            if endpoint == "GetLatestLeaderboard":
+                return latest(recent[:params["limit"]]), 200
+            return leaderboard_page(1, 1, recent), 200
+
+        client = FakeClient(handler)
+        sync = LeaderboardSync(_client=client, limit=1)
+        board = LocalLeaderboard([])
+        sync.track(board, "g", "c")
+        assert len(await sync.poll()) == 2
+        # Refreshed in place, so the caller's reference stays current
+        assert sync.boards[("g", "c", None)] is board and len(board) == 3
+        assert "n2" in sync.seen
@@ -0,0 +1,97 @@
+import json
+
+from speedruncompy.endpoints import PutConversationMessage, PutRunVerification
+from speedruncompy.datatypes.enums import Verified
+from speedruncompy.exceptions import NotFound, ServerException
+from speedruncompy.moderation import BulkExecutor, ModerationWatcher
+
+from utils import FakeClient, make_run, session
+
+
+def moderation_games(counts: dict[str, int]) -> bytes:
+    return json.dumps({"games": [], "gameModerationStats": [{"gameId": g, "state": 0, "count": c} for g, c in counts.items()]}).encode()
+
+def moderation_runs(runs: list[dict], page: int, limit: int) -> bytes:
+    pages = max(1, -(-len(runs) // limit))
+    return json.dumps({"categories": [], "games": [], "levels": [], "platforms": [], "players": [], "regions": [],
+                       "runs": runs[(page - 1) * limit:page * limit], "values": [], "variables": [], "users": [],
+                       "pagination": {"count": len(runs), "page": page, "pages": pages, "per": limit}}).encode()
+
+class TestModerationWatcher():
+    async def test_emits_new_and_changed(self):
+        queues = {"a": [make_run("a1", gameId="a"), make_run("a2", gameId="a")], "b": [], "c": [make_run("c1", gameId="c")]}
+
+        def handler(endpoint, params):
+            if endpoint == "GetModerationGames":
+                return moderation_games({g: len(runs) for g, runs in queues.items()}), 200
+            return moderation_runs(queues[params["gameId"]], params["page"], params["limit"]), 200
+
+        client = FakeClient(handler)
+        watcher = ModerationWatcher(_client=client)
+        assert sorted(r.id for r in await watcher.poll()) == ["a1", "a2", "c1"]
+        # Each queue is fetched in a single page, and empty queues are not fetched
+        assert [(p["gameId"], p["limit"]) for e, p in client.calls if e == "GetModerationRuns"] == [("a", 2), ("c", 1)]
+
+        assert await watcher.poll() == []
+
+        queues["a"][1] = make_run("a2", gameId="a", comment="edited")
+        queues["c"].append(make_run("c2", gameId="c"))
+        assert sorted(r.id for r in await watcher.poll()) == ["a2", "c2"]
+
+    def test_page_size(self):
+        assert ModerationWatcher.page_size(0) == 1
+        assert ModerationWatcher.page_size(57) == 57
+        assert ModerationWatcher.page_size(1000) == 200
+
+
+class TestBulkExecutor():
+    async def test_results_and_retries(self):
+        attempts: dict[str, int] = {}
+
+        def handler(endpoint, params):
+            run = params["runId"]
+            attempts[run] = attempts.get(run, 0) + 1
+            if run == "flaky" and attempts[run] < 3: return b"{}", 503
+            if run == "missing": return b"{}", 404
+            return b'{"ok": true}', 200
+
+        client = FakeClient(handler)
+        actions = [PutRunVerification(r, Verified.VERIFIED, _client=client) for r in ("a", "flaky", "missing")]
+        results = await BulkExecutor(_client=client, retries=3, delay=0).run(actions)
+        assert [r.ok for r in results] == [True, True, False]
+        assert isinstance(results[2].error, NotFound)
+        assert [r.attempts for r in results] == [1, 3, 1]
+
+    async def test_retries_exhausted(self):
+        client = FakeClient(lambda e, p: (b"{}", 500))
+        results = await BulkExecutor(_client=client, retries=2, delay=0).run([PutRunVerification("a", Verified.VERIFIED, _client=client)])
+        assert isinstance(results[0].error, ServerException) and results[0].attempts == 3
+
+    async def test_non_idempotent_not_retried(self):
+        client = FakeClient(lambda e, p: (b"{}", 502))
+        message = PutConversationMessage("t", "conversation", "hi", _client=client)
+        results = await BulkExecutor(_client=client, retries=2, delay=0, csrf=False).run([message])
+        assert isinstance(results[0].error, ServerException) and results[0].attempts == 1
+
+        results = await BulkExecutor(_client=client, retries=2, delay=0, csrf=False, idempotent=lambda r: True).run([message])
+        assert results[0].attempts == 3
+
+    async def test_csrf_cached_and_refreshed(self):
+        tokens = iter(["t1", "t2"])
+        valid = {"t1"}
+
+        def handler(endpoint, params):
+            if endpoint == "GetSession": return session(next(tokens)), 200
+            if params["csrfToken"] not in valid: return b"{}", 403
+            return b'{"ok": true}', 200
+
+        client = FakeClient(handler)
+        executor = BulkExecutor(_client=client, concurrency=3, csrf=True)
+        results = await executor.run([PutRunVerification(str(i), Verified.VERIFIED, _client=client) for i in range(5)])
+        assert all(r.ok for r in results)
+        assert sum(1 for e, _ in client.calls if e == "GetSession") == 1
+
+        valid = {"t2"}
+        results = await executor.run([PutRunVerification("x", Verified.VERIFIED, _client=client)])
+        assert results[0].ok and results[0].attempts == 2
+        assert sum(1 for e, _ in client.calls if e == "GetSession") == 2
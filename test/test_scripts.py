@@ -0,0 +1,70 @@
+import argparse
+import json
+
+from speedruncompy.endpoints import GetGameLeaderboard2
+from speedruncompy.scripts.srcompy_export import export, main, parse_param
+from speedruncompy.checkpoint import Checkpoint, request_key
+
+from utils import FakeClient, paged_handler
+
+import pytest
+
+
+class TestExport():
+    def test_parse_param(self):
+        assert parse_param("gameId=abc") == ("gameId", "abc")
+        assert parse_param('platformIds=["a"]') == ("platformIds", ["a"])
+        assert parse_param("gameId=12345678") == ("gameId", "12345678")
+        assert parse_param("gameId=12e45678") == ("gameId", "12e45678")
+        assert parse_param("limit:=100") == ("limit", 100)
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_param("limit:=abc")
+
+    def test_parquet_rejects_progress(self, tmp_path):
+        for flag in (["--resume"], ["--checkpoint", str(tmp_path / "c.sqlite")]):
+            with pytest.raises(SystemExit):
+                main(["GetGameLeaderboard2", "-o", str(tmp_path / "runs.parquet"), *flag])
+
+    async def test_jsonl(self, tmp_path):
+        output = str(tmp_path / "runs.jsonl")
+        pages = await export(GetGameLeaderboard2("g", "c", _client=FakeClient(paged_handler(3))), output, concurrency=2)
+        assert pages == 3
+        with open(output) as f:
+            assert [json.loads(line)["id"] for line in f] == ["r1", "r2", "r3"]
+
+    async def test_jsonl_resume(self, tmp_path):
+        output = str(tmp_path / "runs.jsonl")
+        with open(output, "w") as f:
+            f.write('{"id":"r1"}\n{"partial')
+        with open(output + ".progress", "w") as f:
+            json.dump({"page": 1, "offset": len('{"id":"r1"}\n')}, f)
+
+        client = FakeClient(paged_handler(3))
+        await export(GetGameLeaderboard2("g", "c", _client=client), output, resume=True)
+        assert [c[1]["page"] for c in client.calls] == [2, 3]
+        with open(output) as f:
+            assert [json.loads(line)["id"] for line in f] == ["r1", "r2", "r3"]
+
+    async def test_jsonl_checkpoint(self, tmp_path):
+        output = str(tmp_path / "runs.jsonl")
+        client = FakeClient(paged_handler(3))
+        request = GetGameLeaderboard2("g", "c", _client=client)
+        with open(output, "w") as f:
+            f.write('{"id":"r1"}\n{"partial')
+        with Checkpoint(str(tmp_path / "progress.sqlite")) as checkpoint:
+            key = f"export:{output}:{request_key(request)}"
+            checkpoint.set(key, {"page": 1, "offset": len('{"id":"r1"}\n')})
+            await export(request, output, resume=True, checkpoint=checkpoint)
+            assert [c[1]["page"] for c in client.calls] == [2, 3]
+            assert checkpoint.get(key) is None
+        with open(output) as f:
+            assert [json.loads(line)["id"] for line in f] == ["r1", "r2", "r3"]
+        assert not (tmp_path / "runs.jsonl.progress").exists()
+
+    async def test_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        output = str(tmp_path / "runs.parquet")
+        await export(GetGameLeaderboard2("g", "c", _client=FakeClient(paged_handler(2))), output, format="parquet")
+        table = pq.read_table(output)
+        assert table.column("id").to_pylist() == ["r1", "r2"]
+        assert table.column("playerIds").to_pylist() == [["p"], ["p"]]
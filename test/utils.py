@@ -1,3 +1,7 @@
+import asyncio
+import json
+
+from speedruncompy.api import SpeedrunClient
 from speedruncompy.datatypes import SpeedrunModel
 
 from typing import TypeVar
@@ -13,3 +17,63 @@ def check_model_coverage(m: SpeedrunModel):
 def check_pages(pages: dict[int, SrcompyModel]):
     for p, model in pages.items():
         check_model_coverage(model)
+
+
+"""Offline helpers: `FakeClient` serves canned bodies instead of contacting SRC."""
+
+def make_run(id: str, **kwargs) -> dict:
+    return {"id": id, "gameId": "g", "categoryId": "c", "time": 1.0, "emulator": False, "verified": 1, "date": 100,
+            "hasSplits": False, "playerIds": ["p"], "valueIds": [], "videoState": 0} | kwargs
+
+def leaderboard_page(page: int, pages: int, runs: list[dict]) -> bytes:
+    return json.dumps({"runList": runs, "playerList": [], "platformList": [],
+                       "pagination": {"count": len(runs) * pages, "page": page, "pages": pages, "per": len(runs)}}).encode()
+
+
+class FakeClient(SpeedrunClient):
+    """Serves responses from `handler(endpoint, params) -> (body, status)` and records every call."""
+    def __init__(self, handler, **kwargs) -> None:
+        super().__init__("Fake", **kwargs)
+        self.handler = handler
+        self.calls: list[tuple[str, dict]] = []
+
+    async def _call(self, endpoint, params):
+        self.calls.append((endpoint, params))
+        await asyncio.sleep(0)
+        body, status = self.handler(endpoint, params)
+        return bytearray(body), status
+
+    async def GET(self, endpoint, params={}):
+        return await self._call(endpoint, params)
+
+    async def POST(self, endpoint, params={}):
+        return await self._call(endpoint, params)
+
+def paged_handler(pages: int):
+    def handler(endpoint, params):
+        page = params.get("page") or 1
+        return leaderboard_page(page, pages, [make_run(f"r{page}")]), 200
+    return handler
+
+
+class StallingClient(FakeClient):
+    """Stalls for the given number of seconds on each successive call."""
+    def __init__(self, stalls: list[float], **kwargs) -> None:
+        super().__init__(paged_handler(1), **kwargs)
+        self.stalls = stalls
+
+    async def _call(self, endpoint, params):
+        stall = self.stalls[len(self.calls)] if len(self.calls) < len(self.stalls) else 0
+        self.calls.append((endpoint, params))
+        await asyncio.sleep(stall)
+        body, status = self.handler(endpoint, params)
+        return bytearray(body), status
+
+
+def session(csrfToken: str, signedIn: bool = True) -> bytes:
+    return json.dumps({"session": {
+        "signedIn": signedIn, "showAds": False, "powerLevel": 0, "dateFormat": 0, "timeFormat": 0, "timeReference": 0,
+        "timeUnits": 0, "homepageStream": 0, "disableThemes": False, "csrfToken": csrfToken, "gameList": [],
+        "gameFollowerList": [], "gameModeratorList": [], "gameRunnerList": [], "seriesList": [], "seriesModeratorList": [],
+        "boostNextTokenDate": 0, "boostNextTokenAmount": 0, "userFollowerList": [], "enabledExperimentIds": [],
+        "challengeModeratorList": []}}).encode()